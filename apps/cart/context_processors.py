@@ -1,4 +1,17 @@
-def cart_count(request):
+from django.utils.safestring import mark_safe
+
+# 캐시된 카탈로그 페이지에서 응답 직전에 실제 수량으로 치환되는 자리표시자
+CART_COUNT_PLACEHOLDER = "<!--cart-count-->"
+
+
+def get_cart_count(request):
+    # 헤더 장바구니 표시: 담긴 상품 종류 수 (수량 합계 아님)
     cart = request.session.get("cart", {})
-    total_quantity = sum(cart.values())
-    return {"cart_count": total_quantity}
+    return len(cart)
+
+
+def cart_count(request):
+    if getattr(request, "defer_cart_count", False):
+        return {"cart_count": mark_safe(CART_COUNT_PLACEHOLDER)}
+
+    return {"cart_count": get_cart_count(request)}
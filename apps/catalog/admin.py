@@ -8,6 +8,7 @@ from django.urls import path
 from django.utils.text import slugify
 
 from .models import (
+    ExchangeRate,
     Product,
     Category,
     ProductImage,
@@ -99,6 +100,7 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "slug", "parent", "sort_order", "is_active")
     list_filter = ("is_active",)
     search_fields = ("name", "slug")
+    list_select_related = ("parent",)
 
 
 @admin.register(ProductVariant)
@@ -139,3 +141,8 @@ class StockLedgerAdmin(admin.ModelAdmin):
     list_filter = ("warehouse", "type", "reference_type")
     search_fields = ("variant__sku", "reference_id")
     list_select_related = ("warehouse", "variant")
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ("currency", "rate_to_krw", "updated_at")
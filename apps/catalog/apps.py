@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CatalogConfig(AppConfig):
     name = "apps.catalog"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,114 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from apps.catalog.models import OfferTombstone, SupplierProduct
+
+
+class Validators:
+    """ETag / Last-Modified 한 쌍 (조건부 GET 응답용)"""
+
+    def __init__(self, parts, last_modified):
+        raw = "|".join(str(part) for part in parts)
+        self.etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        self.last_modified = last_modified
+
+    @property
+    def timestamp(self):
+        return int(self.last_modified.timestamp()) if self.last_modified else None
+
+    def not_modified(self, request):
+        """변경이 없으면 304 응답, 있으면 None"""
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.timestamp
+        )
+
+        if response is not None:
+            self.apply(response)
+
+        return response
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+
+        if self.last_modified:
+            response["Last-Modified"] = http_date(self.timestamp)
+
+        return response
+
+
+def offer_validators(product, *extra, canonical_id=None):
+    """
+    상품 updated_at + 오퍼 최신 updated_at / 개수(삭제 감지)
+    + 공급처 최신 updated_at(공급처명 변경) 기준 validator
+    canonical_id 가 주어지면 대표상품에 연결된 전체 오퍼 기준, 집계 쿼리 1회
+    extra(사용자/장바구니 등) 나 canonical_id 가 있으면 Last-Modified 없이 ETag 만
+    ― 시각이 없는 변경(장바구니 수량, 대표상품 연결 해제)을 If-Modified-Since 가 놓치므로
+    그 외에는 오퍼 삭제 시각(OfferTombstone)까지 Last-Modified 에 포함 (쿼리 1회 추가)
+    """
+    if canonical_id:
+        offers = SupplierProduct.objects.filter(product__canonical_id=canonical_id)
+    else:
+        offers = SupplierProduct.objects.filter(product_id=product.pk)
+
+    stats = offers.aggregate(
+        latest=Max("updated_at"),
+        count=Count("id"),
+        supplier_latest=Max("supplier__updated_at"),
+    )
+
+    last_modified = None
+
+    if not extra and not canonical_id:
+        deleted = OfferTombstone.objects.filter(product_id=product.pk).aggregate(
+            latest=Max("deleted_at")
+        )["latest"]
+
+        last_modified = max(
+            moment
+            for moment in (
+                product.updated_at,
+                stats["latest"],
+                stats["supplier_latest"],
+                deleted,
+            )
+            if moment
+        )
+
+    return Validators(
+        [
+            product.pk,
+            product.updated_at.isoformat(),
+            stats["latest"],
+            stats["count"],
+            stats["supplier_latest"],
+        ]
+        + list(extra),
+        last_modified,
+    )
+
+
+def public_cache(response):
+    # 앞단 캐시(CDN/프록시)가 보관 후 재검증하도록
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.CATALOG_COMPARE_MAX_AGE,
+        s_maxage=settings.CATALOG_COMPARE_MAX_AGE,
+        stale_while_revalidate=settings.CATALOG_COMPARE_MAX_AGE,
+    )
+    return response
+
+
+def private_cache(response):
+    # 장바구니 수량/로그인 메뉴가 들어간 HTML ― 브라우저만 보관, 매번 재검증
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
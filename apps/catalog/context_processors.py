@@ -1,5 +1,8 @@
-from .models import Category
+from django.utils.functional import SimpleLazyObject
+
+from apps.catalog.services.category_tree import get_category_tree
 
 
 def global_categories(request):
-    return {"categories": Category.objects.filter(parent__isnull=True)}
+    # 템플릿에서 실제로 사용할 때만 스냅샷 조회 (admin 등은 비용 없음)
+    return {"categories": SimpleLazyObject(lambda: get_category_tree().roots)}
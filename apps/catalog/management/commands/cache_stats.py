@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.cache_stats import (
+    TRACKED_CACHES,
+    get_stats,
+    reset_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Show catalog cache hit rates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset counters after printing",
+        )
+
+    def handle(self, *args, **options):
+        for name in TRACKED_CACHES:
+            stats = get_stats(name)
+
+            self.stdout.write(
+                f"{name}: hits={stats['hits']} misses={stats['misses']} "
+                f"hit_rate={stats['hit_rate']:.1%}"
+            )
+
+            if options["reset"]:
+                reset_stats(name)
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.catalog.models import Product, SupplierProduct
+from apps.catalog.services.currency import (
+    convert_offer_prices,
+    get_rates,
+    reprice_imported_products,
+    set_rates,
+)
+from apps.catalog.services.facet_engine import refresh_facet_counts
+from apps.catalog.services.offer_summary import (
+    refresh_canonical_offers,
+    refresh_offer_summaries,
+)
+from apps.catalog.services.page_cache import bump_category_versions
+from apps.catalog.services.price_engine import invalidate_price_comparison
+from apps.catalog.services.price_history import record_price_changes
+
+
+class Command(BaseCommand):
+    help = "Update FX rates and recompute KRW prices for every supplier offer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rate",
+            action="append",
+            default=[],
+            metavar="CUR=RATE",
+            help="KRW per unit, e.g. --rate USD=1385.2 (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        rates = {}
+
+        for value in options["rate"]:
+            currency, _, rate = value.partition("=")
+            try:
+                rates[currency.strip().upper()] = float(rate)
+            except ValueError:
+                raise CommandError(f"Invalid --rate: {value}")
+
+        if rates:
+            set_rates(rates)
+
+        product_ids = convert_offer_prices()
+
+        # 환산가가 바뀐 상품만 최저가 요약 / 가격 이력 / 가격비교 캐시 /
+        # 목록 캐시 / 가격대 facet 갱신
+        if product_ids:
+            linked = Product.objects.filter(pk__in=product_ids).values_list(
+                "category_id", "canonical_id"
+            )
+            category_ids = {category_id for category_id, _ in linked}
+            canonical_ids = {canonical_id for _, canonical_id in linked if canonical_id}
+
+            # Product.price(판매가)는 바꾸지 않음 ― 원화 최저가는 best_price
+            refresh_offer_summaries(product_ids)
+            refresh_canonical_offers(canonical_ids)
+            record_price_changes(
+                SupplierProduct.objects.filter(product_id__in=product_ids).only(
+                    "pk", "price_krw", "stock"
+                )
+            )
+            invalidate_price_comparison(product_ids, canonical_ids)
+            bump_category_versions(category_ids)
+            refresh_facet_counts(category_ids)
+
+        # import가 만든 상품만 판매가를 환산가로 (직접 등록한 상품 판매가는 유지)
+        repriced = reprice_imported_products()
+
+        if repriced:
+            bump_category_versions(
+                set(
+                    Product.objects.filter(pk__in=repriced).values_list(
+                        "category_id", flat=True
+                    )
+                )
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rates: {get_rates()} / KRW prices changed for "
+                f"{len(product_ids)} products / "
+                f"sale prices of {len(repriced)} imported products"
+            )
+        )
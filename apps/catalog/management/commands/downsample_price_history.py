@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.catalog.services.price_history import (
+    downsample_price_history,
+    month_start,
+)
+
+
+class Command(BaseCommand):
+    help = "Compress raw price history older than N days into daily min/max/close"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # 월 단위 행이므로 기준일이 속한 월 이전까지만 압축
+        before, _ = month_start(
+            timezone.now() - timedelta(days=options["older_than_days"])
+        )
+
+        months, days = downsample_price_history(before, options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Price history downsampled before {before}: "
+                f"{months} monthly rows → {days} daily rows"
+            )
+        )
@@ -1,8 +1,5 @@
 from django.core.management.base import BaseCommand
-from apps.catalog.services.importers.digikey_importer import (
-    fetch_and_transform,
-    save_products,
-)
+from apps.catalog.services.external_api import response_cache
 from apps.catalog.services.importers.digikey_importer import run_import
 
 
@@ -16,13 +13,27 @@ class Command(BaseCommand):
             default="arduino",
             help="Search keyword for Digikey",
         )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Max results per keyword (default: DIGIKEY_RESULTS_PER_KEYWORD)",
+        )
+        parser.add_argument(
+            "--replay",
+            action="store_true",
+            help="Use recorded Digikey responses only (no network)",
+        )
 
     def handle(self, *args, **options):
+        # 🔥 저장된 응답으로 전체 파이프라인 재실행 (쿼터 소모 없음)
+        if options["replay"]:
+            response_cache.set_replay()
+
         keyword = options["keyword"]
 
         self.stdout.write(f"Searching Digikey for: {keyword}")
 
-        products = fetch_and_transform(keyword)
-        run_import(keyword)
+        run_import(keyword, options["limit"])
 
         self.stdout.write(self.style.SUCCESS("Import completed."))
@@ -1,5 +1,9 @@
 from django.core.management.base import BaseCommand
-from apps.catalog.services.importers.digikey_importer import run_import
+from apps.catalog.services.external_api import response_cache
+from apps.catalog.services.importers.digikey_importer import (
+    DEFAULT_FETCH_CONCURRENCY,
+    run_concurrent_import,
+)
 
 KEYWORDS = [
     "arduino",
@@ -19,12 +23,45 @@ KEYWORDS = [
 class Command(BaseCommand):
     help = "Mass import Digikey products"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_FETCH_CONCURRENCY,
+            help="Number of keywords fetched from Digikey at the same time",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Max results per keyword (default: DIGIKEY_RESULTS_PER_KEYWORD)",
+        )
+        parser.add_argument(
+            "--replay",
+            action="store_true",
+            help="Use recorded Digikey responses only (no network)",
+        )
+
     def handle(self, *args, **options):
-        for keyword in KEYWORDS:
-            print("\n============================")
-            print("IMPORT:", keyword)
-            print("============================\n")
+        # 🔥 저장된 응답으로 전체 파이프라인 재실행 (쿼터 소모 없음)
+        if options["replay"]:
+            response_cache.set_replay()
+
+        print(
+            f"IMPORT: {len(KEYWORDS)} keywords (concurrency {options['concurrency']})"
+        )
+
+        result, failed = run_concurrent_import(
+            KEYWORDS, options["concurrency"], options["limit"]
+        )
+
+        print(
+            f"\ncreated {result.created}, updated {result.updated}, "
+            f"unchanged {result.unchanged}, "
+            f"truncated category paths {result.truncated_paths}"
+        )
 
-            run_import(keyword)
+        if failed:
+            print("failed keywords:", ", ".join(failed))
 
         print("\nImport completed.")
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
-import requests
 from bs4 import BeautifulSoup
 from apps.catalog.models import Product, Category
-import time
+from apps.catalog.services.external_api import response_cache
+from apps.catalog.services.external_api.http_client import get_client
+from apps.catalog.services.facet_engine import deferred_facet_refresh
 
 
 class Command(BaseCommand):
@@ -10,36 +11,51 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("file_path", type=str)
+        parser.add_argument(
+            "--replay",
+            action="store_true",
+            help="Use recorded ICBanQ pages only (no network)",
+        )
 
     def handle(self, *args, **options):
+        # 🔥 저장된 페이지로 재실행 (SUPPLIER_RESPONSE_CACHE_RECORD 로 녹화한 응답)
+        if options["replay"]:
+            response_cache.set_replay()
+
         file_path = options["file_path"]
 
         with open(file_path, "r") as f:
             urls = f.read().splitlines()
 
-        for url in urls:
-            self.stdout.write(f"Processing: {url}")
+        # keep-alive 세션 + 호출 한도(SUPPLIER_APIS["icbanq"]) + 재시도
+        client = get_client("icbanq")
 
-            try:
-                response = requests.get(url, timeout=10)
-                soup = BeautifulSoup(response.text, "html.parser")
+        # 🔹 facet 집계는 상품마다가 아니라 마지막에 한 번
+        with deferred_facet_refresh():
+            for url in urls:
+                self.stdout.write(f"Processing: {url}")
 
-                # 🔹 상품명 (예시 selector — 나중에 실제 구조 맞춰 수정)
-                name = soup.find("h3").get_text(strip=True)
+                try:
+                    # HTML 은 {"text": ...} 로 디스크 캐시에 기록
+                    page = response_cache.cached_json(
+                        "icbanq", {"url": url}, lambda: {"text": client.get(url).text}
+                    )
+                    soup = BeautifulSoup(page["text"], "html.parser")
 
-                # 🔹 가격 (예시)
-                price_tag = soup.find(class_="price")
-                price = price_tag.get_text(strip=True) if price_tag else "0"
+                    # 🔹 상품명 (예시 selector — 나중에 실제 구조 맞춰 수정)
+                    name = soup.find("h3").get_text(strip=True)
 
-                # 🔹 기본 카테고리 (임시)
-                category, _ = Category.objects.get_or_create(name="임시카테고리")
+                    # 🔹 가격 (예시)
+                    price_tag = soup.find(class_="price")
+                    price = price_tag.get_text(strip=True) if price_tag else "0"
 
-                # 🔹 상품 생성
-                Product.objects.create(
-                    name=name, price=price, category=category, source_url=url
-                )
+                    # 🔹 기본 카테고리 (임시)
+                    category, _ = Category.objects.get_or_create(name="임시카테고리")
 
-                time.sleep(1)  # 서버 부담 방지
+                    # 🔹 상품 생성
+                    Product.objects.create(
+                        name=name, price=price, category=category, source_url=url
+                    )
 
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error: {e}"))
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"Error: {e}"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.models import CanonicalProduct, Product
+from apps.catalog.services.offer_summary import (
+    refresh_canonical_offers,
+    refresh_offer_summaries,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized offer summaries (best price, offers, stock)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        ids = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+        updated = 0
+
+        # 대량 테이블 잠금 시간을 줄이기 위해 pk 구간별로 UPDATE
+        for start in range(0, len(ids), batch_size):
+            updated += refresh_offer_summaries(ids[start : start + batch_size])
+
+        canonicals = refresh_canonical_offers(CanonicalProduct.objects.values("pk"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Offer summaries reconciled: {updated} products, "
+                f"{canonicals} canonical products"
+            )
+        )
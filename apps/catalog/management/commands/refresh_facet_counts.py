@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.facet_engine import refresh_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute precomputed facet counts for listing pages"
+
+    def handle(self, *args, **options):
+        rows = refresh_facet_counts()
+
+        self.stdout.write(self.style.SUCCESS(f"Facet counts refreshed: {rows} rows"))
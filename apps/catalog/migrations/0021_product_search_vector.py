@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:43
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_search_vectors(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+
+    vector = Subquery(
+        Product.objects.filter(pk=OuterRef("pk"))
+        .annotate(
+            vector=SearchVector(
+                "name", "mpn", "serial_number", weight="A", config="simple"
+            )
+            + SearchVector("manufacturer", "brand", weight="B", config="simple")
+            + SearchVector("category__name", weight="C", config="simple")
+        )
+        .values("vector")[:1]
+    )
+
+    Product.objects.update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0020_canonicalproduct_product_canonical"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="catalog_pro_search_gin"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
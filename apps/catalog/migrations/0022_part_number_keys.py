@@ -0,0 +1,117 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+import re
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# services.part_number.normalize_part_number 의 이 시점 사본
+# (서비스 코드가 바뀌어도 마이그레이션 결과는 그대로)
+NON_ALNUM = re.compile(r"[^0-9A-Z]")
+DIGIKEY_SUFFIX = re.compile(r"-ND$", re.IGNORECASE)
+
+
+def normalize_part_number(value):
+    value = (value or "").strip().upper()
+    value = DIGIKEY_SUFFIX.sub("", value)
+    return NON_ALNUM.sub("", value)
+
+
+def backfill_part_number_keys(apps, schema_editor):
+    targets = [
+        ("Product", "mpn", "mpn_key"),
+        ("SupplierProduct", "supplier_part_number", "part_key"),
+        ("CanonicalProduct", "mpn", "mpn_key"),
+    ]
+
+    for model_name, source_field, key_field in targets:
+        model = apps.get_model("catalog", model_name)
+
+        batch = []
+
+        for obj in model.objects.only("pk", source_field).iterator(chunk_size=2000):
+            setattr(obj, key_field, normalize_part_number(getattr(obj, source_field)))
+            batch.append(obj)
+
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, [key_field])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, [key_field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0021_product_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="canonicalproduct",
+            name="mpn_key",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="mpn_key",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name="supplierproduct",
+            name="part_key",
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_part_number_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="canonicalproduct",
+            index=models.Index(
+                fields=["mpn_key"],
+                name="catalog_can_mpn_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="canonicalproduct",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["mpn_key"],
+                name="catalog_can_mpn_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["mpn_key"],
+                name="catalog_pro_mpn_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["mpn_key"],
+                name="catalog_pro_mpn_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supplierproduct",
+            index=models.Index(
+                fields=["part_key"],
+                name="catalog_sup_part_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supplierproduct",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["part_key"],
+                name="catalog_sup_part_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
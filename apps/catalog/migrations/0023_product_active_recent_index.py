@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0022_part_number_keys"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="catalog_pro_active_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:52
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_category_paths(apps, schema_editor):
+    Category = apps.get_model("catalog", "Category")
+
+    children = defaultdict(list)
+
+    for pk, parent_id in Category.objects.values_list("id", "parent_id"):
+        children[parent_id].append(pk)
+
+    nodes = []
+    stack = [(pk, "/") for pk in children[None]]
+
+    while stack:
+        pk, prefix = stack.pop()
+        path = f"{prefix}{pk}/"
+
+        nodes.append(Category(id=pk, path=path, depth=path.count("/") - 2))
+        stack.extend((child, path) for child in children[pk])
+
+    Category.objects.bulk_update(nodes, ["path", "depth"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0023_product_active_recent_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_category_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["path"],
+                name="catalog_cat_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
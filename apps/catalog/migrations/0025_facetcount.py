@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0024_category_materialized_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("facet", models.CharField(max_length=30)),
+                ("value", models.CharField(max_length=200)),
+                ("label", models.CharField(blank=True, max_length=200)),
+                ("count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_counts",
+                        to="catalog.category",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["category", "facet", "-count"],
+                        name="catalog_fac_categor_53166e_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "facet", "value"),
+                        name="catalog_facetcount_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
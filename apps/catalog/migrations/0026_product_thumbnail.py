@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:48
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_thumbnails(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    ProductImage = apps.get_model("catalog", "ProductImage")
+
+    first_image = (
+        ProductImage.objects.filter(product_id=OuterRef("pk"))
+        .order_by("-is_thumbnail", "id")
+        .values("image")[:1]
+    )
+
+    Product.objects.filter(images__isnull=False).distinct().update(
+        thumbnail=Coalesce(Subquery(first_image), Value(""))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0025_facetcount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="thumbnail",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_thumbnails, migrations.RunPython.noop),
+    ]
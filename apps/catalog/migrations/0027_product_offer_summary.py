@@ -0,0 +1,90 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_offer_summaries(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    SupplierProduct = apps.get_model("catalog", "SupplierProduct")
+
+    offers = SupplierProduct.objects.filter(product_id=OuterRef("pk"))
+    best = offers.order_by("price", "id")
+    totals = offers.order_by().values("product_id")
+
+    Product.objects.filter(supplier_products__isnull=False).distinct().update(
+        best_price=Subquery(best.values("price")[:1]),
+        best_supplier_id=Subquery(best.values("supplier_id")[:1]),
+        supplier_count=Coalesce(
+            Subquery(
+                totals.annotate(n=Count("supplier_id", distinct=True)).values("n")
+            ),
+            0,
+        ),
+        total_stock=Coalesce(Subquery(totals.annotate(n=Sum("stock")).values("n")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0026_product_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="best_price",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="best_supplier",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="catalog.supplier",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="supplier_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="total_stock",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_offer_summaries, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.OrderBy(
+                    Coalesce("best_price", "price", output_field=models.FloatField()),
+                    nulls_last=True,
+                ),
+                models.F("id"),
+                condition=models.Q(("is_active", True)),
+                name="catalog_pro_list_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                models.OrderBy(
+                    Coalesce("best_price", "price", output_field=models.FloatField()),
+                    descending=True,
+                    nulls_last=True,
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("is_active", True)),
+                name="catalog_pro_list_price_desc",
+            ),
+        ),
+    ]
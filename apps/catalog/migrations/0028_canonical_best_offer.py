@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_canonical_offers(apps, schema_editor):
+    CanonicalProduct = apps.get_model("catalog", "CanonicalProduct")
+    SupplierProduct = apps.get_model("catalog", "SupplierProduct")
+
+    offers = SupplierProduct.objects.filter(product__canonical_id=OuterRef("pk"))
+    best = offers.order_by("price", "id")
+    totals = offers.order_by().values("product__canonical_id")
+
+    CanonicalProduct.objects.update(
+        best_offer_id=Subquery(best.values("pk")[:1]),
+        best_price=Subquery(best.values("price")[:1]),
+        offer_count=Coalesce(Subquery(totals.annotate(n=Count("id")).values("n")), 0),
+        supplier_count=Coalesce(
+            Subquery(
+                totals.annotate(n=Count("supplier_id", distinct=True)).values("n")
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0027_product_offer_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="canonicalproduct",
+            name="best_offer",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="catalog.supplierproduct",
+            ),
+        ),
+        migrations.AddField(
+            model_name="canonicalproduct",
+            name="best_price",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="canonicalproduct",
+            name="offer_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="canonicalproduct",
+            name="supplier_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_canonical_offers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:56
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0028_canonical_best_offer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "times",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "prices",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "stocks",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "offer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_history",
+                        to="catalog.supplierproduct",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("offer", "month")},
+            },
+        ),
+        migrations.CreateModel(
+            name="PriceHistoryDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("min_price", models.FloatField()),
+                ("max_price", models.FloatField()),
+                ("close_price", models.FloatField()),
+                ("close_stock", models.IntegerField(default=0)),
+                (
+                    "offer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_history_daily",
+                        to="catalog.supplierproduct",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("offer", "day")},
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:59
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_currency(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    CanonicalProduct = apps.get_model("catalog", "CanonicalProduct")
+    SupplierProduct = apps.get_model("catalog", "SupplierProduct")
+
+    # Digi-Key UnitPrice는 USD로 저장되어 왔음 (환율 등록 후 convert_prices로 환산)
+    # 등록된 환율이 아직 없으므로 원화 외 오퍼의 price_krw 는 NULL (최저가 계산에서 제외)
+    SupplierProduct.objects.filter(supplier__code="digikey").update(currency="USD")
+    SupplierProduct.objects.filter(currency="KRW").update(price_krw=F("price"))
+
+    # 0027 / 0028 에서 통화 구분 없이 price 로 채운 최저가 요약을 원화 기준으로 다시 계산
+    # (offer_summary.BEST_OFFER_ORDER 와 동일)
+    order = (F("price_krw").asc(nulls_last=True), "id")
+
+    best = SupplierProduct.objects.filter(product_id=OuterRef("pk")).order_by(*order)
+    Product.objects.filter(supplier_products__isnull=False).distinct().update(
+        best_price=Subquery(best.values("price_krw")[:1]),
+        best_supplier_id=Subquery(best.values("supplier_id")[:1]),
+    )
+
+    best = SupplierProduct.objects.filter(
+        product__canonical_id=OuterRef("pk")
+    ).order_by(*order)
+    CanonicalProduct.objects.update(
+        best_offer_id=Subquery(best.values("pk")[:1]),
+        best_price=Subquery(best.values("price_krw")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0029_price_history"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3, unique=True)),
+                ("rate_to_krw", models.FloatField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="supplierproduct",
+            name="currency",
+            field=models.CharField(default="KRW", max_length=3),
+        ),
+        migrations.AddField(
+            model_name="supplierproduct",
+            name="price_krw",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_currency, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0030_currency"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="supplierproduct",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0032_supplier_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfferTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_id", models.BigIntegerField(db_index=True)),
+                ("supplier", models.CharField(blank=True, max_length=50)),
+                (
+                    "supplier_part_number",
+                    models.CharField(blank=True, max_length=200),
+                ),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
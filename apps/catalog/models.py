@@ -1,8 +1,18 @@
 import os
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce, Concat, Substr
+
+from apps.catalog.services.part_number import normalize_part_number
+
+# 🔥 목록 표시가 = 가격 정렬/필터/가격대 기준 (공급처 원화 최저가, 오퍼가 없으면 판매가)
+LIST_PRICE = Coalesce("best_price", "price", output_field=models.FloatField())
 
 
 class Category(models.Model):
@@ -21,9 +31,21 @@ class Category(models.Model):
         on_delete=models.CASCADE,
     )
 
+    # 🔥 materialized path: "/1/5/12/" (루트 → 자기 자신), save 시 자동 유지
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
     class Meta:
         unique_together = ("parent", "slug")
 
+        indexes = [
+            models.Index(
+                fields=["path"],
+                name="catalog_cat_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         self.clean()
 
@@ -46,38 +68,68 @@ class Category(models.Model):
 
             self.slug = slug_candidate
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._sync_path()
+
+    def _sync_path(self):
+        old_path = self.path
+        old_depth = self.depth
+
+        prefix = self.parent.path if self.parent else "/"
+        new_path = f"{prefix}{self.pk}/"
+        new_depth = new_path.count("/") - 2
+
+        if new_path == old_path:
+            return
+
+        Category.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+
+        # 🔹 re-parent: 하위 노드 경로를 UPDATE 1회로 치환
+        if old_path:
+            Category.objects.filter(path__startswith=old_path).exclude(
+                pk=self.pk
+            ).update(
+                path=Concat(Value(new_path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + (new_depth - old_depth),
+            )
+
+        self.path = new_path
+        self.depth = new_depth
+
+    def get_ancestor_ids(self):
+        return [int(pk) for pk in self.path.strip("/").split("/")[:-1] if pk]
 
     def get_ancestors(self):
-        nodes = []
-        cur = self.parent
-        while cur:
-            nodes.append(cur)
-            cur = cur.parent
-        return list(reversed(nodes))
+        ids = self.get_ancestor_ids()
+        nodes = Category.objects.in_bulk(ids)
+        return [nodes[pk] for pk in ids if pk in nodes]
 
     def get_descendant_ids(self):
-        ids = []
-        stack = [self]
-        while stack:
-            node = stack.pop()
-            ids.append(node.id)
-            stack.extend(list(node.children.all()))
-        return ids
+        # 자기 자신 포함
+        if not self.path:
+            return [self.pk]
+
+        return list(
+            Category.objects.filter(path__startswith=self.path).values_list(
+                "id", flat=True
+            )
+        )
 
     def get_depth(self):
-        depth = 0
-        parent = self.parent
-        while parent:
-            depth += 1
-            parent = parent.parent
-        return depth
+        return self.depth
 
     def __str__(self):
-        return "—" * self.get_depth() + self.name
+        return "—" * self.depth + self.name
 
     def clean(self):
-        if self.parent and self.parent.get_depth() >= 4:
+        if not self.parent:
+            return
+
+        if self.pk and self.path and self.parent.path.startswith(self.path):
+            raise ValidationError("하위 카테고리를 상위 카테고리로 지정할 수 없습니다.")
+
+        if self.parent.depth >= 4:
             raise ValidationError("카테고리는 최대 5단계까지만 허용됩니다.")
 
 
@@ -119,6 +171,9 @@ class Product(models.Model):
 
     mpn = models.CharField(max_length=200, blank=True, db_index=True)
 
+    # 🔥 부품번호 검색 키 (normalize_part_number(mpn), save 시 자동 계산)
+    mpn_key = models.CharField(max_length=200, blank=True, editable=False)
+
     # 🔥 supplier part number
     serial_number = models.CharField(max_length=120, unique=True)
 
@@ -148,6 +203,9 @@ class Product(models.Model):
 
     image_url = models.URLField(blank=True)
 
+    # 🔥 목록용 대표 이미지 (ProductImage 변경 시 signals에서 갱신)
+    thumbnail = models.CharField(max_length=255, blank=True, editable=False)
+
     is_active = models.BooleanField(default=True)
 
     is_reviewed = models.BooleanField(default=False)
@@ -156,6 +214,22 @@ class Product(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 🔥 가격비교 요약 (SupplierProduct 변경 시 offer_summary에서 갱신)
+    best_price = models.FloatField(null=True, blank=True, editable=False)
+    best_supplier = models.ForeignKey(
+        "Supplier",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+    )
+    supplier_count = models.IntegerField(default=0, editable=False)
+    total_stock = models.IntegerField(default=0, editable=False)
+
+    # 🔥 전문 검색용 (name/mpn/serial/manufacturer/brand/category.name)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["slug"]),
@@ -163,19 +237,61 @@ class Product(models.Model):
             models.Index(fields=["price"]),
             models.Index(fields=["external_id"]),
             models.Index(fields=["manufacturer", "mpn"]),  # 🔥 MPN 통합 핵심
+            # 🔥 목록 커서 페이지네이션 (created_at, id)
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="catalog_pro_active_recent_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # 🔥 가격 정렬/필터 (views.PRICE_SORTS 와 같은 식/순서)
+            models.Index(
+                LIST_PRICE.asc(nulls_last=True),
+                F("id"),
+                name="catalog_pro_list_price_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                LIST_PRICE.desc(nulls_last=True),
+                F("id").desc(),
+                name="catalog_pro_list_price_desc",
+                condition=models.Q(is_active=True),
+            ),
+            GinIndex(fields=["search_vector"], name="catalog_pro_search_gin"),
+            models.Index(
+                fields=["mpn_key"],
+                name="catalog_pro_mpn_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            GinIndex(
+                fields=["mpn_key"],
+                name="catalog_pro_mpn_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        self.mpn_key = normalize_part_number(self.mpn)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
     @property
-    def lowest_price(self):
-        prices = self.supplier_products.values_list("price", flat=True)
+    def thumbnail_url(self):
+        # 업로드 이미지 우선, 없으면 importer가 받아온 image_url
+        if self.thumbnail:
+            return default_storage.url(self.thumbnail)
 
-        if prices:
-            return min(prices)
+        return self.image_url
 
-        return None
+    @property
+    def lowest_price(self):
+        return self.best_price
+
+    @property
+    def list_price(self):
+        # 목록/상세 표시가 (LIST_PRICE 와 같은 기준)
+        return self.price if self.best_price is None else self.best_price
 
     canonical = models.ForeignKey(
         "CanonicalProduct",
@@ -315,10 +431,25 @@ class Supplier(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    # 가격비교 응답 validator(conditional.offer_validators)에 포함 ― 공급처명 변경 감지
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return self.name
 
 
+class ExchangeRate(models.Model):
+    """통화별 원화 환율 (1 단위 = rate_to_krw 원), currency 서비스에서 캐시"""
+
+    currency = models.CharField(max_length=3, unique=True)
+    rate_to_krw = models.FloatField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.currency} = {self.rate_to_krw} KRW"
+
+
 class SupplierProduct(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE)
 
@@ -328,11 +459,21 @@ class SupplierProduct(models.Model):
 
     supplier_part_number = models.CharField(max_length=200)
 
+    # 🔥 부품번호 검색 키 (normalize_part_number(supplier_part_number))
+    part_key = models.CharField(max_length=200, blank=True, editable=False)
+
+    # 공급처 통화 기준 원가 + 원화 환산가 (비교/정렬은 price_krw 기준)
     price = models.FloatField()
+    currency = models.CharField(max_length=3, default="KRW")
+    price_krw = models.FloatField(null=True, blank=True, editable=False)
+
     stock = models.IntegerField(default=0)
 
     url = models.URLField()
 
+    # 🔥 마지막으로 import한 공급처 데이터 해시 (같으면 bulk import에서 쓰기 생략)
+    content_hash = models.CharField(max_length=32, blank=True, editable=False)
+
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -342,14 +483,30 @@ class SupplierProduct(models.Model):
             models.Index(fields=["product"]),
             models.Index(fields=["price"]),
             models.Index(fields=["supplier"]),
+            models.Index(
+                fields=["part_key"],
+                name="catalog_sup_part_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            GinIndex(
+                fields=["part_key"],
+                name="catalog_sup_part_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        self.part_key = normalize_part_number(self.supplier_part_number)
+        super().save(*args, **kwargs)
+
 
 class CanonicalProduct(models.Model):
     manufacturer = models.CharField(max_length=200, db_index=True)
 
     mpn = models.CharField(max_length=200, db_index=True)
 
+    mpn_key = models.CharField(max_length=200, blank=True, editable=False)
+
     name = models.CharField(max_length=300)
 
     category = models.ForeignKey(
@@ -358,10 +515,140 @@ class CanonicalProduct(models.Model):
 
     image_url = models.URLField(blank=True)
 
+    # 🔥 연결된 모든 Product의 오퍼 중 최저가 (offer_summary에서 갱신)
+    best_offer = models.ForeignKey(
+        "SupplierProduct",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+    )
+    best_price = models.FloatField(null=True, blank=True, editable=False)
+    offer_count = models.IntegerField(default=0, editable=False)
+    supplier_count = models.IntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("manufacturer", "mpn")
 
+        indexes = [
+            models.Index(
+                fields=["mpn_key"],
+                name="catalog_can_mpn_key_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            GinIndex(
+                fields=["mpn_key"],
+                name="catalog_can_mpn_key_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.mpn_key = normalize_part_number(self.mpn)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.manufacturer} {self.mpn}"
+
+
+class FacetCount(models.Model):
+    """
+    카테고리 하위 전체 기준 facet 값별 상품 수 (facet_engine.refresh_facet_counts)
+    category=None → 전체 상품 기준
+    """
+
+    category = models.ForeignKey(
+        Category,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="facet_counts",
+    )
+
+    facet = models.CharField(max_length=30)
+    value = models.CharField(max_length=200)
+    label = models.CharField(max_length=200, blank=True)
+    count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "facet", "-count"]),
+        ]
+        constraints = [
+            # 전체 합계(category=None)도 값당 1행 → upsert 대상
+            models.UniqueConstraint(
+                fields=["category", "facet", "value"],
+                nulls_distinct=False,
+                name="catalog_facetcount_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value} ({self.count})"
+
+
+class PriceHistory(models.Model):
+    """
+    오퍼별 월 단위 가격/재고 변경 이력 (price_history.record_price_changes)
+    변경된 시점만 배열에 추가: times[i] = 월 시작 기준 초, prices[i], stocks[i]
+    """
+
+    offer = models.ForeignKey(
+        SupplierProduct, on_delete=models.CASCADE, related_name="price_history"
+    )
+
+    month = models.DateField()  # 해당 월 1일
+
+    times = ArrayField(models.IntegerField(), default=list)
+    prices = ArrayField(models.FloatField(), default=list)
+    stocks = ArrayField(models.IntegerField(), default=list)
+
+    class Meta:
+        unique_together = ("offer", "month")
+
+    def __str__(self):
+        return f"{self.offer_id} {self.month:%Y-%m} ({len(self.times)})"
+
+
+class PriceHistoryDaily(models.Model):
+    """오래된 PriceHistory를 일 단위로 압축 (downsample_price_history)"""
+
+    offer = models.ForeignKey(
+        SupplierProduct, on_delete=models.CASCADE, related_name="price_history_daily"
+    )
+
+    day = models.DateField()
+
+    min_price = models.FloatField()
+    max_price = models.FloatField()
+    close_price = models.FloatField()
+    close_stock = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("offer", "day")
+
+    def __str__(self):
+        return f"{self.offer_id} {self.day} {self.close_price}"
+
+
+class OfferTombstone(models.Model):
+    """
+    삭제된 export 행 기록 (offer_export 증분 export 에서 deleted 행으로 내보냄)
+    오퍼 삭제 / 다른 상품으로 이동 시 이전 (상품, 공급처, 부품번호),
+    상품 삭제 시 supplier 가 빈 상품 단위 행
+    """
+
+    # 가격비교 응답 Last-Modified(conditional.offer_validators)에 상품별 최근 삭제 시각 포함
+    product_id = models.BigIntegerField(db_index=True)
+    supplier = models.CharField(max_length=50, blank=True)  # Supplier.code
+    supplier_part_number = models.CharField(max_length=200, blank=True)
+
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.product_id} {self.supplier} {self.supplier_part_number}"
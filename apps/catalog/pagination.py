@@ -0,0 +1,148 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+def encode_cursor(direction, obj):
+    raw = f"{direction}|{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        direction, created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+
+        if direction not in (NEXT, PREVIOUS):
+            return None
+
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+
+
+class CursorPage:
+    """
+    Paginator Page 대신 쓰는 (created_at, id) 커서 페이지
+    COUNT / OFFSET 없이 인덱스 범위 스캔만 사용
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate_by_cursor(queryset, token, per_page):
+    cursor = decode_cursor(token) if token else None
+
+    if cursor is None:
+        direction = NEXT
+        rows = list(queryset.order_by("-created_at", "-id")[: per_page + 1])
+    else:
+        direction, created_at, pk = cursor
+
+        if direction == NEXT:
+            rows = list(
+                queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+                ).order_by("-created_at", "-id")[: per_page + 1]
+            )
+        else:
+            rows = list(
+                queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+                ).order_by("created_at", "id")[: per_page + 1]
+            )
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == PREVIOUS:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, cursor is not None
+
+    if not rows:
+        return CursorPage(rows)
+
+    return CursorPage(
+        rows,
+        next_cursor=encode_cursor(NEXT, rows[-1]) if has_next else None,
+        previous_cursor=encode_cursor(PREVIOUS, rows[0]) if has_previous else None,
+    )
+
+
+class CappedPaginator(Paginator):
+    """
+    커서 모드의 ?page= 용: CATALOG_MAX_OFFSET_PAGE 까지만 페이지 번호 노출
+    마지막 번호 페이지 다음은 커서로 이어감 (page.next_cursor)
+    """
+
+    @cached_property
+    def num_pages(self):
+        return min(super().num_pages, settings.CATALOG_MAX_OFFSET_PAGE)
+
+    def page(self, number):
+        page = super().page(number)
+        page.next_cursor = None
+
+        if page.number == self.num_pages and self.count > page.number * self.per_page:
+            page.next_cursor = encode_cursor(NEXT, page[-1])
+
+        return page
+
+
+def paginate_products(request, queryset, allow_cursor=True):
+    """
+    - ?cursor= 가 있으면 커서 모드
+    - ?page= 는 기존대로 Paginator (커서 모드에서는 얕은 페이지만 허용)
+    - allow_cursor=False: 관련도순 검색 결과처럼 created_at 정렬이 아닌 경우
+    """
+    per_page = settings.CATALOG_PAGE_SIZE
+    token = request.GET.get("cursor")
+    page = request.GET.get("page")
+
+    if allow_cursor and token:
+        return paginate_by_cursor(queryset, token, per_page)
+
+    if allow_cursor and settings.CATALOG_CURSOR_PAGINATION:
+        if not page:
+            return paginate_by_cursor(queryset, None, per_page)
+
+        if page.isdigit() and int(page) > settings.CATALOG_MAX_OFFSET_PAGE:
+            raise Http404("Page not found")
+
+        return CappedPaginator(queryset, per_page).get_page(page)
+
+    return Paginator(queryset, per_page).get_page(page)
@@ -13,3 +13,4 @@ class NormalizedItem:
     url: str
     category_path: list[str] | None = None
     image_url: str | None = None
+    currency: str = "KRW"  # price 통화
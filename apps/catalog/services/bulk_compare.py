@@ -0,0 +1,182 @@
+from collections import defaultdict
+
+import orjson
+from django.db.models import Q
+
+from apps.catalog.models import Product, SupplierProduct
+from apps.catalog.services.offer_summary import BEST_OFFER_ORDER
+from apps.catalog.services.part_number import (
+    normalize_manufacturer,
+    normalize_part_number,
+)
+
+# 요청 1회 최대 부품 수
+MAX_BULK_PARTS = 2000
+
+# 이보다 많으면 청크 단위로 조회하면서 스트리밍 응답
+BULK_STREAM_THRESHOLD = 200
+
+# 청크당 쿼리 3회 (공급처 부품번호 → 상품 → 오퍼)
+BULK_CHUNK_SIZE = 500
+
+
+def parse_parts(parts):
+    """
+    요청 부품 목록 정규화
+    "slug-or-mpn" | {"slug": ...} | {"mpn": ...} | {"manufacturer": ..., "mpn": ...}
+    """
+    if not isinstance(parts, list) or not parts:
+        raise ValueError("parts must be a non-empty list")
+
+    if len(parts) > MAX_BULK_PARTS:
+        raise ValueError(f"too many parts (max {MAX_BULK_PARTS})")
+
+    specs = []
+
+    for part in parts:
+        if isinstance(part, str):
+            # 문자열은 slug 우선, 없으면 부품번호로
+            spec = {"slug": part.strip(), "mpn": part}
+        elif isinstance(part, dict) and (part.get("slug") or part.get("mpn")):
+            spec = {
+                "slug": str(part.get("slug") or "").strip(),
+                "mpn": str(part.get("mpn") or ""),
+                "manufacturer": str(part.get("manufacturer") or "").strip(),
+            }
+        else:
+            raise ValueError(f"invalid part: {part!r}")
+
+        spec["query"] = part
+        spec["key"] = normalize_part_number(spec["mpn"])
+        specs.append(spec)
+
+    return specs
+
+
+def _resolve_chunk(specs):
+    slugs = {spec["slug"] for spec in specs if spec["slug"]}
+    keys = {spec["key"] for spec in specs if spec["key"]}
+
+    # 🔹 공급처 부품번호(part_key) 매칭
+    part_matches = defaultdict(set)
+    for key, product_id in SupplierProduct.objects.filter(
+        part_key__in=keys
+    ).values_list("part_key", "product_id"):
+        part_matches[key].add(product_id)
+
+    # 🔹 slug / 상품 MPN / 대표상품 MPN / 공급처 부품번호 → 상품 1회 조회
+    product_ids = {pk for ids in part_matches.values() for pk in ids}
+    products = {
+        row["id"]: row
+        for row in Product.objects.filter(is_active=True)
+        .filter(
+            Q(slug__in=slugs)
+            | Q(mpn_key__in=keys)
+            | Q(canonical__mpn_key__in=keys)
+            | Q(pk__in=product_ids)
+        )
+        .values(
+            "id",
+            "slug",
+            "name",
+            "manufacturer",
+            "mpn",
+            "mpn_key",
+            "best_price",
+            "canonical__mpn_key",
+        )
+    }
+
+    by_slug = {}
+    by_key = defaultdict(set)
+    for row in products.values():
+        by_slug[row["slug"]] = row["id"]
+        for key in (row["mpn_key"], row["canonical__mpn_key"]):
+            if key:
+                by_key[key].add(row["id"])
+    for key, ids in part_matches.items():
+        by_key[key].update(pk for pk in ids if pk in products)
+
+    # 🔹 오퍼 1회 조회 (DB에서 가격순 정렬)
+    offers = defaultdict(list)
+    for offer in (
+        SupplierProduct.objects.filter(product_id__in=list(products))
+        .order_by("product_id", *BEST_OFFER_ORDER)
+        .values(
+            "product_id",
+            "supplier__name",
+            "supplier__code",
+            "supplier_part_number",
+            "price",
+            "currency",
+            "price_krw",
+            "stock",
+            "url",
+        )
+    ):
+        offers[offer["product_id"]].append(
+            {
+                "supplier": offer["supplier__name"],
+                "supplier_code": offer["supplier__code"],
+                "part_number": offer["supplier_part_number"],
+                "price": offer["price_krw"],
+                "original_price": offer["price"],
+                "currency": offer["currency"],
+                "stock": offer["stock"],
+                "url": offer["url"],
+            }
+        )
+
+    for spec in specs:
+        if spec["slug"] in by_slug:
+            ids = {by_slug[spec["slug"]]}
+        else:
+            ids = by_key.get(spec["key"], set())
+
+        # "TI Inc." / "ti" 처럼 표기만 다른 제조사도 같은 것으로 (법인 표기/구두점 무시)
+        manufacturer = normalize_manufacturer(spec.get("manufacturer"))
+        if manufacturer:
+            ids = {
+                pk
+                for pk in ids
+                if normalize_manufacturer(products[pk]["manufacturer"]) == manufacturer
+            }
+
+        yield {
+            "query": spec["query"],
+            "matched": bool(ids),
+            "products": [
+                {
+                    "id": pk,
+                    "slug": products[pk]["slug"],
+                    "name": products[pk]["name"],
+                    "manufacturer": products[pk]["manufacturer"],
+                    "mpn": products[pk]["mpn"],
+                    "best_price": products[pk]["best_price"],
+                    "offers": offers[pk],
+                }
+                for pk in sorted(ids)
+            ],
+        }
+
+
+def iter_bulk_comparison(specs, chunk_size=BULK_CHUNK_SIZE):
+    """요청 순서대로 부품별 결과 반환 (청크 단위 set 기반 조회)"""
+    for start in range(0, len(specs), chunk_size):
+        yield from _resolve_chunk(specs[start : start + chunk_size])
+
+
+def bulk_comparison_json(specs):
+    return orjson.dumps({"results": list(iter_bulk_comparison(specs))})
+
+
+def stream_bulk_comparison_json(specs):
+    # {"results": [ ... ]} 를 부품 단위로 나눠서 전송
+    yield b'{"results":['
+
+    for index, result in enumerate(iter_bulk_comparison(specs)):
+        if index:
+            yield b","
+        yield orjson.dumps(result)
+
+    yield b"]}"
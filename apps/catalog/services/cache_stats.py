@@ -0,0 +1,42 @@
+from django.core.cache import cache
+
+STATS_KEY = "catalog:cache_stats:{name}:{kind}"
+
+# cache_stats 명령에서 보여줄 캐시 이름
+TRACKED_CACHES = ["page", "price", "digikey_token"]
+
+
+def _incr(name, kind):
+    key = STATS_KEY.format(name=name, kind=kind)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def record_hit(name):
+    _incr(name, "hits")
+
+
+def record_miss(name):
+    _incr(name, "misses")
+
+
+def get_stats(name):
+    hits = cache.get(STATS_KEY.format(name=name, kind="hits"), 0)
+    misses = cache.get(STATS_KEY.format(name=name, kind="misses"), 0)
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def reset_stats(name):
+    cache.delete_many(
+        [STATS_KEY.format(name=name, kind=kind) for kind in ("hits", "misses")]
+    )
@@ -0,0 +1,203 @@
+import hashlib
+
+import orjson
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from apps.catalog.models import Category
+from apps.catalog.services.category_tree import (
+    get_tree_version,
+    invalidate_category_tree,
+)
+
+# Category.clean() 과 동일 (최대 5단계)
+MAX_CATEGORY_DEPTH = 5
+
+# 경로 → 카테고리 id 캐시 (트리 버전이 키에 들어가므로 카테고리 수정 시 자동 무효화)
+PATH_CACHE_KEY = "catalog:category_path:{version}:{digest}"
+PATH_CACHE_TIMEOUT = 60 * 60 * 24
+
+# pg_advisory_xact_lock(namespace, key): 카테고리 일괄 생성 직렬화
+# (facet_engine.FACET_LOCK_NAMESPACE 와 겹치지 않게)
+CATEGORY_LOCK_NAMESPACE = 7302
+CATEGORY_CREATE_LOCK = 0
+
+NAME_MAX_LENGTH = Category._meta.get_field("name").max_length
+SLUG_MAX_LENGTH = Category._meta.get_field("slug").max_length
+
+
+def _names(path):
+    names = [str(name).strip()[:NAME_MAX_LENGTH] for name in path or ()]
+    return tuple(name for name in names if name)
+
+
+def normalize_path(path):
+    """
+    ["A", " B ", ""] → ("A", "B") (빈 단계 제거, 길이/깊이 제한)
+    MAX_CATEGORY_DEPTH 보다 깊으면 하위 단계는 잘림 (is_truncated 로 확인)
+    """
+    return _names(path)[:MAX_CATEGORY_DEPTH]
+
+
+def is_truncated(path):
+    return len(_names(path)) > MAX_CATEGORY_DEPTH
+
+
+def _cache_key(version, path):
+    digest = hashlib.sha1(orjson.dumps(path)).hexdigest()
+    return PATH_CACHE_KEY.format(version=version, digest=digest)
+
+
+def resolve_category_paths(paths):
+    """
+    카테고리 경로 여러 개를 한 번에 조회/생성 → {경로 tuple: category id}
+    공유 캐시 → 단계(depth)별 일괄 조회 + bulk_create 순
+    (경로 n개, 깊이 d 이면 캐시 미스여도 쿼리는 d 단계 × 몇 회)
+    """
+    paths = {normalize_path(path) for path in paths} - {()}
+
+    if not paths:
+        return {}
+
+    version = get_tree_version()
+    keys = {path: _cache_key(version, path) for path in paths}
+
+    cached = cache.get_many(keys.values())
+    resolved = {path: cached[key] for path, key in keys.items() if key in cached}
+
+    missing = paths - resolved.keys()
+
+    if missing:
+        resolved.update(_resolve(missing))
+
+    return resolved
+
+
+@transaction.atomic
+def _resolve(paths):
+    # (부모 id, 이름) → Category, 단계별로 채워 나감
+    nodes = {}
+    created = False
+    locked = False
+
+    for depth in range(max(len(path) for path in paths)):
+        wanted = {
+            (nodes[path[:depth]].pk if depth else None, path[depth])
+            for path in paths
+            if len(path) > depth
+        }
+
+        level = _existing_level(wanted)
+        new = sorted(key for key in wanted if key not in level)
+
+        if new and not locked:
+            # 같은 경로를 동시에 만드는 import 직렬화 (커밋까지 유지)
+            # 기다리는 동안 다른 트랜잭션이 만든 카테고리가 있으므로 다시 조회
+            _lock()
+            locked = True
+            level = _existing_level(wanted)
+            new = sorted(key for key in wanted if key not in level)
+
+        if new:
+            created = True
+            level.update(_bulk_create_level(new, nodes, depth))
+
+        for path in paths:
+            if len(path) > depth:
+                parent = nodes[path[:depth]].pk if depth else None
+                nodes[path[: depth + 1]] = level[(parent, path[depth])]
+
+    resolved = {path: nodes[path].pk for path in paths}
+
+    def remember():
+        # 새로 만든 카테고리가 있으면 트리 버전을 먼저 바꾸고 새 버전 키로 저장
+        if created:
+            invalidate_category_tree()
+
+        version = get_tree_version()
+        cache.set_many(
+            {_cache_key(version, path): pk for path, pk in resolved.items()},
+            PATH_CACHE_TIMEOUT,
+        )
+
+    transaction.on_commit(remember)
+
+    return resolved
+
+
+def _lock():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s, %s)",
+            [CATEGORY_LOCK_NAMESPACE, CATEGORY_CREATE_LOCK],
+        )
+
+
+def _existing_level(wanted):
+    """(부모 id, 이름) 집합 → 이미 있는 카테고리 (같은 키가 여럿이면 pk 가 작은 쪽)"""
+    level = {}
+    roots = Q(parent__isnull=True, name__in=[n for p, n in wanted if p is None])
+    children = Q(
+        parent_id__in={p for p, _n in wanted if p is not None},
+        name__in={n for p, n in wanted if p is not None},
+    )
+
+    for category in Category.objects.filter(roots | children).order_by("pk"):
+        level.setdefault((category.parent_id, category.name), category)
+
+    return level
+
+
+def _bulk_create_level(keys, nodes, depth):
+    """
+    한 단계의 새 카테고리 일괄 생성 (_lock 안에서만 호출)
+    save()를 거치지 않으므로 slug(전역 유일) / path / depth 를 직접 채움
+    """
+    parents = {node.pk: node for node in nodes.values()}
+
+    bases = {}
+
+    for parent_id, name in keys:
+        base = slugify(name, allow_unicode=True) or "category"
+
+        if parent_id is not None:
+            base = f"{parents[parent_id].slug}-{base}"
+
+        bases[(parent_id, name)] = base[: SLUG_MAX_LENGTH - 4].strip("-")
+
+    # 후보 slug가 이미 쓰였는지 쿼리 1회로 확인
+    query = Q()
+    for base in set(bases.values()):
+        query |= Q(slug__startswith=base)
+
+    taken = set(Category.objects.filter(query).values_list("slug", flat=True))
+
+    categories = []
+
+    for key in keys:
+        slug = bases[key]
+        counter = 2
+
+        while slug in taken:
+            slug = f"{bases[key]}-{counter}"
+            counter += 1
+
+        taken.add(slug)
+
+        parent_id, name = key
+        categories.append(
+            Category(name=name, slug=slug, parent_id=parent_id, depth=depth)
+        )
+
+    Category.objects.bulk_create(categories)
+
+    # pk가 생긴 뒤에 materialized path 채움
+    for category in categories:
+        prefix = parents[category.parent_id].path if category.parent_id else "/"
+        category.path = f"{prefix}{category.pk}/"
+
+    Category.objects.bulk_update(categories, ["path"])
+
+    return {(category.parent_id, category.name): category for category in categories}
@@ -0,0 +1,134 @@
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from apps.catalog.models import Category
+
+VERSION_CACHE_KEY = "catalog:category_tree:version"
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    id: int
+    name: str
+    slug: str
+    parent_id: int | None
+    path: str
+    depth: int
+    sort_order: int
+    is_active: bool
+    children: tuple = ()  # 활성 하위 카테고리만 (sort_order 순)
+
+
+@dataclass(frozen=True)
+class CategoryTree:
+    version: str
+    roots: tuple
+    by_id: MappingProxyType
+    by_slug: MappingProxyType
+    descendants: MappingProxyType
+
+    def get(self, pk):
+        return self.by_id.get(pk)
+
+    def get_by_slug(self, slug):
+        return self.by_slug.get(slug)
+
+    def get_root(self, node):
+        return self.by_id[int(node.path.split("/")[1])]
+
+    def get_ancestors(self, node):
+        ids = [int(pk) for pk in node.path.strip("/").split("/")[:-1]]
+        return [self.by_id[pk] for pk in ids if pk in self.by_id]
+
+    def descendant_ids(self, node):
+        # 자기 자신 포함, 비활성 하위 카테고리도 포함 (Category.get_descendant_ids와 동일)
+        return self.descendants.get(node.id, (node.id,))
+
+
+def build_category_tree(version):
+    rows = list(
+        Category.objects.order_by("-depth", "sort_order", "id").values(
+            "id",
+            "name",
+            "slug",
+            "parent_id",
+            "path",
+            "depth",
+            "sort_order",
+            "is_active",
+        )
+    )
+
+    # 깊은 노드부터 만들어야 frozen 노드에 children을 채울 수 있음
+    # (같은 depth 안에서는 sort_order, id 순이므로 형제 순서도 유지됨)
+    children = defaultdict(list)
+    by_id = {}
+    by_slug = {}
+    descendants = defaultdict(list)
+
+    for row in rows:
+        node = CategoryNode(**row, children=tuple(children.pop(row["id"], ())))
+        by_id[node.id] = node
+
+        if node.is_active:
+            children[node.parent_id].append(node)
+
+        for pk in node.path.strip("/").split("/"):
+            if pk:
+                descendants[int(pk)].append(node.id)
+
+    for pk in sorted(by_id):
+        by_slug.setdefault(by_id[pk].slug, by_id[pk])
+
+    return CategoryTree(
+        version=version,
+        roots=tuple(children.get(None, ())),
+        by_id=MappingProxyType(by_id),
+        by_slug=MappingProxyType(by_slug),
+        descendants=MappingProxyType(
+            {pk: tuple(ids) for pk, ids in descendants.items()}
+        ),
+    )
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def get_tree_version():
+    version = cache.get(VERSION_CACHE_KEY)
+
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_CACHE_KEY)
+
+    return version
+
+
+def get_category_tree():
+    """
+    프로세스 단위 카테고리 트리 스냅샷
+    공유 캐시의 버전이 바뀌었을 때만 쿼리 1회로 재생성
+    """
+    global _snapshot
+
+    version = get_tree_version()
+    snapshot = _snapshot
+
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = build_category_tree(version)
+
+        return _snapshot
+
+
+def invalidate_category_tree():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
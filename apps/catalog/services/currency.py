@@ -0,0 +1,146 @@
+import numpy as np
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Cast, Floor
+from django.utils import timezone
+
+from apps.catalog.models import ExchangeRate, Product, SupplierProduct
+
+BASE_CURRENCY = "KRW"
+
+RATES_CACHE_KEY = "catalog:fx_rates"
+RATES_CACHE_TIMEOUT = 60 * 60
+
+# convert_offer_prices 에서 한 번에 읽고 쓰는 오퍼 수
+CONVERT_CHUNK_SIZE = 10000
+
+_UPDATE_SQL = """
+    UPDATE {table} AS sp
+    SET price_krw = v.price_krw, updated_at = now()
+    FROM unnest(%s::bigint[], %s::double precision[]) AS v(id, price_krw)
+    WHERE sp.id = v.id AND sp.price_krw IS DISTINCT FROM v.price_krw
+    RETURNING sp.product_id
+"""
+
+
+def get_rates():
+    """{통화: 원화 환율} ― 공유 캐시, 없으면 ExchangeRate 테이블 1회 조회"""
+    rates = cache.get(RATES_CACHE_KEY)
+
+    if rates is None:
+        rates = dict(ExchangeRate.objects.values_list("currency", "rate_to_krw"))
+        rates[BASE_CURRENCY] = 1.0
+        cache.set(RATES_CACHE_KEY, rates, RATES_CACHE_TIMEOUT)
+
+    return rates
+
+
+def invalidate_rates():
+    cache.delete(RATES_CACHE_KEY)
+
+
+def set_rates(rates):
+    """rates: {"USD": 1385.2, ...} 저장 후 캐시 삭제"""
+    with transaction.atomic():
+        for currency, rate in rates.items():
+            ExchangeRate.objects.update_or_create(
+                currency=currency.upper(), defaults={"rate_to_krw": float(rate)}
+            )
+
+    invalidate_rates()
+
+
+def to_krw(amount, currency, rates=None):
+    """단건 환산 (환율 미등록 통화는 None)"""
+    if amount is None:
+        return None
+
+    rate = (rates or get_rates()).get((currency or BASE_CURRENCY).upper())
+
+    if rate is None:
+        return None
+
+    return round(float(amount) * rate, 2)
+
+
+def convert_prices(prices, currencies, rates):
+    """
+    가격/통화 배열 → 원화 배열 (NumPy 벡터 연산, 미등록 통화는 NaN)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    codes, index = np.unique(np.asarray(currencies, dtype=object), return_inverse=True)
+    table = np.array([rates.get(code, np.nan) for code in codes], dtype=np.float64)
+
+    return np.round(prices * table[index], 2)
+
+
+def convert_offer_prices(chunk_size=CONVERT_CHUNK_SIZE):
+    """
+    전체 오퍼 price_krw 재계산 (청크별 SELECT 1회 + UPDATE 1회)
+    반환: price_krw 가 바뀐 오퍼의 product_id 집합
+    """
+    rates = get_rates()
+    changed = set()
+
+    rows = SupplierProduct.objects.order_by("pk").values_list("pk", "price", "currency")
+    last_pk = 0
+
+    while True:
+        chunk = list(rows.filter(pk__gt=last_pk)[:chunk_size])
+
+        if not chunk:
+            break
+
+        ids, prices, currencies = zip(*chunk)
+        last_pk = ids[-1]
+
+        krw = convert_prices(prices, currencies, rates)
+
+        # NaN(환율 미등록) → NULL
+        values = krw.astype(object)
+        values[np.isnan(krw)] = None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _UPDATE_SQL.format(table=SupplierProduct._meta.db_table),
+                [list(ids), values.tolist()],
+            )
+            changed.update(product_id for (product_id,) in cursor.fetchall())
+
+    return changed
+
+
+def reprice_imported_products():
+    """
+    import가 만든 상품(Product.serial_number = 오퍼 공급처 부품번호)의 판매가를
+    그 오퍼의 원화 환산가로 맞춤 (upsert 와 같은 int 절사)
+    통화 도입 전 import된 상품은 USD 금액이 그대로 Product.price 에 남아 있음
+    직접 등록한 상품(부품번호가 다른 상품)과 환율 미등록 통화는 건드리지 않음
+    반환: 판매가가 바뀐 product_id 집합
+    """
+    imported = (
+        SupplierProduct.objects.filter(
+            product_id=OuterRef("pk"),
+            supplier_part_number=OuterRef("serial_number"),
+            price_krw__isnull=False,
+        )
+        .exclude(currency=BASE_CURRENCY)
+        .order_by("-updated_at", "-pk")
+    )
+    price = Cast(Floor(Subquery(imported.values("price_krw")[:1])), IntegerField())
+
+    changed = set(
+        Product.objects.annotate(krw=price)
+        .filter(krw__isnull=False)
+        .exclude(price=F("krw"))
+        .values_list("pk", flat=True)
+    )
+
+    if changed:
+        # updated_at → 상품 카드 fragment 캐시 키 갱신
+        Product.objects.filter(pk__in=changed).update(
+            price=price, updated_at=timezone.now()
+        )
+
+    return changed
@@ -1,44 +1,94 @@
 import os
-import requests
+from django.conf import settings
 from dotenv import load_dotenv
 from pathlib import Path
-from .digikey_auth import get_access_token
+from .digikey_auth import get_access_token, invalidate_access_token
+from . import response_cache
+from .http_client import SupplierApiError, get_client
 
 BASE_DIR = Path(__file__).resolve().parents[4]
 load_dotenv(BASE_DIR / ".env")
 
 CLIENT_ID = os.getenv("DIGIKEY_CLIENT_ID")
-ENV = os.getenv("DIGIKEY_ENV")
 
-if ENV == "sandbox":
-    BASE_URL = "https://sandbox-api.digikey.com"
-else:
-    BASE_URL = "https://api.digikey.com"
 
+# v4 keyword search 한 번에 받을 수 있는 최대 건수
+MAX_PAGE_SIZE = 50
+
+
+SEARCH_PATH = "/products/v4/search/keyword"
 
-def search_products(keyword="Raspberry Pi"):
-    token = get_access_token()
 
-    url = f"{BASE_URL}/products/v4/search/keyword"
+def search_products(keyword="Raspberry Pi", limit=5, offset=0):
+    payload = {
+        "Keywords": keyword,
+        "Limit": limit,
+        "Offset": offset,
+    }
+
+    # 🔥 응답은 디스크 캐시에 기록 (--replay 시 API 호출 없이 재사용)
+    return response_cache.cached_json(
+        "digikey",
+        {
+            "path": SEARCH_PATH,
+            "currency": settings.DIGIKEY_CURRENCY,
+            "payload": payload,
+        },
+        lambda: _post_search(payload),
+    )
+
+
+def _post_search(payload, retry_auth=True):
+    token = get_access_token()
 
     headers = {
         "Authorization": f"Bearer {token}",
         "X-DIGIKEY-Client-Id": CLIENT_ID,
+        # UnitPrice 통화 (SupplierProduct.currency 와 일치해야 함)
+        "X-DIGIKEY-Locale-Currency": settings.DIGIKEY_CURRENCY,
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
 
-    payload = {
-        "Keywords": keyword,
-        "RecordCount": 5,
-    }
+    try:
+        response = get_client("digikey").post(
+            SEARCH_PATH, json=payload, headers=headers
+        )
+    except SupplierApiError as e:
+        # 캐시된 토큰이 거부되면 새로 발급받아 한 번만 재시도
+        if e.status == 401 and retry_auth:
+            invalidate_access_token()
+            return _post_search(payload, retry_auth=False)
+        raise
 
-    response = requests.post(url, json=payload, headers=headers)
+    return response.json()
 
-    if response.status_code != 200:
-        raise Exception(response.text)
 
-    return response.json()
+def iter_search_pages(keyword, max_results, page_size=MAX_PAGE_SIZE):
+    """
+    Limit/Offset 페이지를 차례로 조회해 페이지별 normalize 결과를 yield
+    (한 번에 한 페이지만 메모리에 유지)
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    offset = 0
+
+    while offset < max_results:
+        data = search_products(
+            keyword, limit=min(page_size, max_results - offset), offset=offset
+        )
+        products = normalize_products(data)
+
+        if not products:
+            return
+
+        yield products
+
+        offset += len(products)
+
+        # 🔹 전체 결과 수(ProductsCount)에 도달하면 종료
+        total = data.get("ProductsCount")
+        if total is not None and offset >= total:
+            return
 
 
 def normalize_products(data):
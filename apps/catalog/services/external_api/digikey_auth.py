@@ -1,24 +1,44 @@
 import os
-import requests
+import threading
+import time
+
+from django.core.cache import cache
 from dotenv import load_dotenv
 from pathlib import Path
 
+from apps.catalog.services.cache_stats import get_stats, record_hit, record_miss
+from .http_client import get_client
+
 BASE_DIR = Path(__file__).resolve().parents[4]
 load_dotenv(BASE_DIR / ".env")
 
 CLIENT_ID = os.getenv("DIGIKEY_CLIENT_ID")
 CLIENT_SECRET = os.getenv("DIGIKEY_CLIENT_SECRET")
-ENV = os.getenv("DIGIKEY_ENV")
 
-if ENV == "sandbox":
-    TOKEN_URL = "https://sandbox-api.digikey.com/v1/oauth2/token"
-else:
-    TOKEN_URL = "https://api.digikey.com/v1/oauth2/token"
+TOKEN_PATH = "/v1/oauth2/token"
 
+# 워커 간 공유 토큰 (token, expires_at epoch)
+TOKEN_CACHE_KEY = "digikey:access_token"
+TOKEN_LOCK_KEY = "digikey:access_token:lock"
 
-def get_access_token():
-    response = requests.post(
-        TOKEN_URL,
+# 만료 이 시간(초) 전부터는 새 토큰 발급
+TOKEN_SAFETY_MARGIN = 60
+
+# 다른 워커가 발급 중일 때 기다리는 최대 시간(초)
+TOKEN_LOCK_WAIT = 5
+
+# cache_stats 이름 (misses = 실제 토큰 발급 횟수)
+TOKEN_STATS = "digikey_token"
+
+_token = None
+_expires_at = 0.0
+_lock = threading.Lock()
+
+
+def fetch_access_token():
+    """OAuth client_credentials 발급 → (token, expires_in)"""
+    response = get_client("digikey").post(
+        TOKEN_PATH,
         data={
             "client_id": CLIENT_ID,
             "client_secret": CLIENT_SECRET,
@@ -27,7 +47,95 @@ def get_access_token():
         headers={"Content-Type": "application/x-www-form-urlencoded"},
     )
 
-    if response.status_code != 200:
-        raise Exception(response.text)
+    data = response.json()
+
+    return data["access_token"], int(data.get("expires_in") or 600)
+
+
+def _valid(expires_at):
+    return time.time() < expires_at - TOKEN_SAFETY_MARGIN
+
+
+def _from_shared_cache():
+    global _token, _expires_at
+
+    cached = cache.get(TOKEN_CACHE_KEY)
+
+    if cached and _valid(cached[1]):
+        _token, _expires_at = cached
+        return _token
+
+    return None
+
+
+def _refresh():
+    global _token, _expires_at
+
+    # 워커 간 중복 발급 방지: 다른 워커가 발급 중이면 공유 캐시에 올라올 때까지 대기
+    acquired = cache.add(TOKEN_LOCK_KEY, 1, TOKEN_LOCK_WAIT * 2)
+
+    if not acquired:
+        deadline = time.time() + TOKEN_LOCK_WAIT
+
+        while time.time() < deadline:
+            time.sleep(0.2)
+
+            token = _from_shared_cache()
+            if token:
+                record_hit(TOKEN_STATS)
+                return token
+
+    try:
+        token, expires_in = fetch_access_token()
+        expires_at = time.time() + expires_in
+
+        cache.set(
+            TOKEN_CACHE_KEY,
+            (token, expires_at),
+            max(1, expires_in - TOKEN_SAFETY_MARGIN),
+        )
+        _token, _expires_at = token, expires_at
+
+        record_miss(TOKEN_STATS)
+
+        return token
+    finally:
+        if acquired:
+            cache.delete(TOKEN_LOCK_KEY)
+
+
+def get_access_token():
+    """
+    Digi-Key access token
+    프로세스 메모리 → 공유 캐시 → 발급 순, 발급은 프로세스 내 lock으로 1회만
+    """
+    if _token and _valid(_expires_at):
+        record_hit(TOKEN_STATS)
+        return _token
+
+    with _lock:
+        if _token and _valid(_expires_at):
+            record_hit(TOKEN_STATS)
+            return _token
+
+        token = _from_shared_cache()
+        if token:
+            record_hit(TOKEN_STATS)
+            return token
+
+        return _refresh()
+
+
+def invalidate_access_token():
+    """401 응답 등으로 토큰이 거부되었을 때"""
+    global _token, _expires_at
+
+    with _lock:
+        _token, _expires_at = None, 0.0
+        cache.delete(TOKEN_CACHE_KEY)
+
+
+def token_stats():
+    stats = get_stats(TOKEN_STATS)
 
-    return response.json()["access_token"]
+    return {"hits": stats["hits"], "refreshes": stats["misses"]}
@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# 재시도 대상 응답 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SupplierApiError(Exception):
+    def __init__(self, supplier, status, message, url=""):
+        self.supplier = supplier
+        self.status = status
+        self.url = url
+        super().__init__(f"[{supplier}] {status} {url}: {message[:500]}")
+
+
+class TokenBucket:
+    """
+    분당 rate 개 토큰을 채우는 버킷 (최대 burst 개 저장)
+    acquire()는 토큰이 생길 때까지 대기, 스레드 안전
+    """
+
+    def __init__(
+        self, rate_per_minute, burst=1, clock=time.monotonic, sleep=time.sleep
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _fill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                self._fill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            self.sleep(wait)
+
+
+def retry_after_seconds(response):
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 초, 없으면 None"""
+    value = response.headers.get("Retry-After")
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class SupplierClient:
+    """
+    공급처 API 공용 HTTP 클라이언트
+    keep-alive 세션 풀 + 타임아웃 + 429/5xx 지수 백오프(jitter) + 호출 한도
+    Retry-After 가 있으면 그 시간만큼 그대로 대기, retry_after_max 초과면 SupplierApiError
+    """
+
+    def __init__(
+        self,
+        name,
+        base_url="",
+        rate_per_minute=60,
+        burst=1,
+        timeout=(5, 30),
+        max_retries=4,
+        backoff_base=0.5,
+        backoff_max=30.0,
+        retry_after_max=600.0,
+        pool_size=10,
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.limiter = TokenBucket(rate_per_minute, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, path):
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def backoff(self, attempt, response=None):
+        if response is not None:
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                # 서버가 요청한 시간보다 일찍 재시도하지 않음 (backoff_max 미적용)
+                if retry_after > self.retry_after_max:
+                    raise SupplierApiError(
+                        self.name,
+                        response.status_code,
+                        f"Retry-After {retry_after:.0f}s exceeds "
+                        f"retry_after_max {self.retry_after_max:.0f}s",
+                        response.url,
+                    )
+                return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def request(self, method, path, **kwargs):
+        url = self.url(path)
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise SupplierApiError(self.name, None, str(e), url) from e
+
+                time.sleep(self.backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self.backoff(attempt, response))
+                continue
+
+            if response.status_code >= 400:
+                raise SupplierApiError(
+                    self.name, response.status_code, response.text, url
+                )
+
+            return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name):
+    """settings.SUPPLIER_APIS[name] 설정으로 만든 프로세스 공용 클라이언트"""
+    client = _clients.get(name)
+
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+
+            if client is None:
+                options = dict(settings.SUPPLIER_APIS.get(name, {}))
+                options.setdefault("timeout", settings.SUPPLIER_HTTP_TIMEOUT)
+                options.setdefault("max_retries", settings.SUPPLIER_HTTP_MAX_RETRIES)
+                options.setdefault(
+                    "retry_after_max", settings.SUPPLIER_HTTP_RETRY_AFTER_MAX
+                )
+                client = _clients[name] = SupplierClient(name, **options)
+
+    return client
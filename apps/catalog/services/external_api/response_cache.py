@@ -0,0 +1,85 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import orjson
+from django.conf import settings
+
+# 🔥 import 재실행용 (--replay: 네트워크 없이 저장된 응답만 사용)
+_replay = False
+
+
+class ReplayMissError(Exception):
+    """replay 모드인데 저장된 응답이 없음"""
+
+
+def set_replay(enabled=True):
+    global _replay
+    _replay = enabled
+
+
+def replaying():
+    return _replay
+
+
+def request_key(supplier, request):
+    """공급처 + 요청 내용(dict) → sha256 (같은 요청이면 같은 키)"""
+    data = orjson.dumps([supplier, request], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _path(key):
+    return Path(settings.SUPPLIER_RESPONSE_CACHE_DIR) / key[:2] / f"{key}.json.gz"
+
+
+def load(key):
+    try:
+        with gzip.open(_path(key), "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def store(key, data):
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 임시 파일에 쓴 뒤 rename (동시 import에서도 반쯤 쓴 파일 없음)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            fileobj=raw, mode="wb", mtime=0
+        ) as f:
+            f.write(orjson.dumps(data))
+
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def cached_json(supplier, request, fetch):
+    """
+    공급처 JSON 응답 디스크 캐시
+    replay 모드: 저장된 응답만 (없으면 ReplayMissError)
+    그 외: fetch() 호출, SUPPLIER_RESPONSE_CACHE_RECORD 이면 응답 저장
+    """
+    key = request_key(supplier, request)
+
+    if _replay:
+        data = load(key)
+
+        if data is None:
+            raise ReplayMissError(f"{supplier}: no recorded response for {request}")
+
+        return data
+
+    data = fetch()
+
+    if settings.SUPPLIER_RESPONSE_CACHE_RECORD:
+        store(key, data)
+
+    return data
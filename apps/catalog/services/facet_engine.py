@@ -0,0 +1,394 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, Q, Sum, Value, When
+
+from apps.catalog.models import (
+    LIST_PRICE,
+    Category,
+    FacetCount,
+    Mall,
+    Product,
+    Supplier,
+    SupplierProduct,
+)
+from apps.catalog.services.page_cache import bump_category_versions
+
+# (value, label, min, max)  ― 표시가(LIST_PRICE: 공급처 최저가, 없으면 판매가) 기준, 원 단위
+# (min_price/max_price 필터, 가격 정렬과 같은 식, 쿼리셋에 alias(list_price=...) 필요)
+PRICE_BANDS = [
+    ("0-10000", "1만원 미만", 0, 10000),
+    ("10000-50000", "1만~5만원", 10000, 50000),
+    ("50000-100000", "5만~10만원", 50000, 100000),
+    ("100000-", "10만원 이상", 100000, None),
+]
+
+FACETS = [
+    ("manufacturer", "제조사"),
+    ("brand", "브랜드"),
+    ("supplier", "공급처"),
+    ("price", "가격대"),
+    ("mall", "몰"),
+    ("in_stock", "재고"),
+]
+
+# 화면에 표시할 facet별 최대 값 개수
+MAX_FACET_VALUES = 20
+
+# 집계에 쓰이는 Product 필드 (save(update_fields=...) 가 이와 겹치지 않으면 재계산 불필요)
+FACET_FIELDS = {
+    "category",
+    "manufacturer",
+    "brand",
+    "mall",
+    "best_price",
+    "price",
+    "total_stock",
+    "is_active",
+}
+
+# pg_advisory_xact_lock(namespace, key): 1차 카테고리 id 별 / 전체 합계는 0
+FACET_LOCK_NAMESPACE = 7301
+GLOBAL_FACET_LOCK = 0
+
+_deferred = threading.local()
+
+
+def price_band_q(value):
+    for band, _label, low, high in PRICE_BANDS:
+        if band == value:
+            q = Q(list_price__gte=low)
+            if high is not None:
+                q &= Q(list_price__lt=high)
+            return q
+
+    return None
+
+
+def apply_facet_filters(queryset, params):
+    """
+    GET 파라미터 기준 필터 적용 (같은 facet 안에서는 OR, facet 간에는 AND)
+    ?manufacturer=TI&manufacturer=ST&price=0-10000&in_stock=1
+    가격대(price)와 ?min_price=&max_price= 는 모두 표시가(LIST_PRICE) 기준
+    (오퍼가 없어 best_price 가 NULL 인 상품은 판매가로 걸러짐)
+    """
+    queryset = queryset.alias(list_price=LIST_PRICE)
+
+    for facet in ("manufacturer", "brand"):
+        values = params.getlist(facet)
+        if values:
+            queryset = queryset.filter(**{f"{facet}__in": values})
+
+    suppliers = params.getlist("supplier")
+    if suppliers:
+        queryset = queryset.filter(
+            pk__in=SupplierProduct.objects.filter(supplier__code__in=suppliers).values(
+                "product_id"
+            )
+        )
+
+    malls = params.getlist("mall")
+    if malls:
+        queryset = queryset.filter(mall__code__in=malls)
+
+    price_q = Q()
+    for value in params.getlist("price"):
+        band_q = price_band_q(value)
+        if band_q is not None:
+            price_q |= band_q
+    if price_q:
+        queryset = queryset.filter(price_q)
+
+    for param, lookup in (("min_price", "gte"), ("max_price", "lte")):
+        try:
+            value = float(params.get(param, ""))
+        except ValueError:
+            continue
+        queryset = queryset.filter(**{f"list_price__{lookup}": value})
+
+    if params.get("in_stock") == "1":
+        queryset = queryset.filter(total_stock__gt=0)
+
+    return queryset
+
+
+def build_facets(category_id, params):
+    """
+    미리 계산된 FacetCount 조회 (인덱스 쿼리 1회)
+    반환: [{"key", "label", "options": [{"value", "label", "count", "selected"}]}]
+    """
+    rows = FacetCount.objects.filter(category_id=category_id).order_by(
+        "facet", "-count", "value"
+    )
+
+    options = {key: [] for key, _label in FACETS}
+
+    for row in rows:
+        if row.facet not in options or len(options[row.facet]) >= MAX_FACET_VALUES:
+            continue
+
+        options[row.facet].append(
+            {
+                "value": row.value,
+                "label": row.label or row.value,
+                "count": row.count,
+                "selected": row.value in params.getlist(row.facet),
+            }
+        )
+
+    return [
+        {"key": key, "label": label, "options": options[key]}
+        for key, label in FACETS
+        if options[key]
+    ]
+
+
+def _leaf_counts(products):
+    """
+    (facet, category_id, value) → 상품 수
+    facet마다 GROUP BY 1회 (카테고리 말단 기준), 상위 합산은 파이썬에서
+    """
+    counts = Counter()
+
+    for facet in ("manufacturer", "brand"):
+        rows = (
+            products.exclude(**{facet: ""})
+            .values_list("category_id", facet)
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for category_id, value, n in rows:
+            counts[(facet, category_id, value)] += n
+
+    rows = (
+        SupplierProduct.objects.filter(product__in=products)
+        .values_list("product__category_id", "supplier__code")
+        .annotate(n=Count("product_id", distinct=True))
+        .order_by()
+    )
+    for category_id, value, n in rows:
+        counts[("supplier", category_id, value)] += n
+
+    rows = (
+        products.exclude(mall__isnull=True)
+        .values_list("category_id", "mall__code")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for category_id, value, n in rows:
+        counts[("mall", category_id, value)] += n
+
+    band = Case(
+        *[
+            When(price_band_q(value), then=Value(value))
+            for value, _label, _low, _high in PRICE_BANDS
+        ],
+        output_field=CharField(),
+    )
+    rows = (
+        products.alias(list_price=LIST_PRICE)
+        .annotate(band=band)
+        .exclude(band__isnull=True)
+        .values_list("category_id", "band")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for category_id, value, n in rows:
+        counts[("price", category_id, value)] += n
+
+    rows = (
+        products.filter(total_stock__gt=0)
+        .values_list("category_id")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for category_id, n in rows:
+        counts[("in_stock", category_id, "1")] += n
+
+    return counts
+
+
+def _labels():
+    labels = {("price", value): label for value, label, _low, _high in PRICE_BANDS}
+    labels[("in_stock", "1")] = "재고 있음"
+
+    for code, name in Supplier.objects.values_list("code", "name"):
+        labels[("supplier", code)] = name
+
+    for code, name in Mall.objects.values_list("code", "name"):
+        labels[("mall", code)] = name
+
+    return labels
+
+
+@contextmanager
+def deferred_facet_refresh():
+    """
+    행 단위 저장이 많은 경로(importer 등)용
+    블록 안에서 signal 이 요청한 재계산은 모아 두었다가 블록 끝에서 1회만 실행
+    """
+    if getattr(_deferred, "category_ids", None) is not None:
+        yield
+        return
+
+    _deferred.category_ids = set()
+
+    try:
+        yield
+        category_ids = _deferred.category_ids
+    finally:
+        _deferred.category_ids = None
+
+    if category_ids:
+        refresh_facet_counts(category_ids)
+
+
+def defer_facet_refresh(category_ids):
+    """deferred_facet_refresh 블록 안이면 카테고리를 모아 두고 True"""
+    pending = getattr(_deferred, "category_ids", None)
+
+    if pending is None:
+        return False
+
+    pending.update(category_ids)
+    return True
+
+
+def _lock(keys):
+    # 같은 1차 카테고리 재계산은 직렬화 (커밋 시점까지 유지, 항상 같은 순서로 잡음)
+    with connection.cursor() as cursor:
+        for key in keys:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)", [FACET_LOCK_NAMESPACE, key]
+            )
+
+
+def _replace(existing, rows):
+    """
+    existing 범위의 FacetCount 를 rows 로 교체
+    (category, facet, value) 기준 upsert 후 rows 에 없는 기존 행만 삭제
+    """
+    keys = {(row.category_id, row.facet, row.value) for row in rows}
+
+    FacetCount.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["category", "facet", "value"],
+        update_fields=["label", "count", "updated_at"],
+    )
+
+    stale = [
+        pk
+        for pk, *key in existing.values_list("pk", "category_id", "facet", "value")
+        if tuple(key) not in keys
+    ]
+
+    if stale:
+        FacetCount.objects.filter(pk__in=stale).delete()
+
+
+def _ancestor_ids(path):
+    # "/1/5/12/" → [1, 5, 12] (자기 자신 포함)
+    return [int(pk) for pk in path.strip("/").split("/")]
+
+
+@transaction.atomic
+def refresh_facet_counts(category_ids=None):
+    """
+    FacetCount 재계산
+    category_ids 가 주어지면 해당 카테고리와 상위 카테고리(경로) 행만 다시 계산
+    경로 카테고리에 직접 속한 상품만 집계하고, 경로 밖 하위 카테고리는 저장된 합계를 더함
+    전체 합계(category=None)는 항상 갱신
+    동시에 실행되면 1차 카테고리 / 전체 합계 단위 advisory lock 으로 순서대로 처리
+    커밋 후 재계산한 카테고리의 페이지 캐시 버전 갱신 (이전 facet 으로 채워진 페이지 폐기)
+    """
+    products = Product.objects.filter(is_active=True)
+
+    if category_ids is not None:
+        ids = {
+            pk
+            for path in Category.objects.filter(pk__in=set(category_ids))
+            .exclude(path="")
+            .values_list("path", flat=True)
+            for pk in _ancestor_ids(path)
+        }
+
+        if not ids:
+            return 0
+
+        categories = Category.objects.filter(pk__in=ids)
+        products = products.filter(category_id__in=ids)
+    else:
+        categories = Category.objects.all()
+
+    paths = dict(categories.exclude(path="").values_list("id", "path"))
+    root_ids = {_ancestor_ids(path)[0] for path in paths.values()}
+
+    _lock(sorted(root_ids))
+
+    totals = Counter()
+
+    for (facet, category_id, value), n in _leaf_counts(products).items():
+        if category_id not in paths:
+            continue
+
+        for ancestor_id in _ancestor_ids(paths[category_id]):
+            totals[(facet, ancestor_id, value)] += n
+
+    if category_ids is not None:
+        # 경로 밖 하위 카테고리(형제 subtree)는 바뀌지 않았으므로 저장된 합계 사용
+        # (같은 1차 카테고리 재계산은 lock 으로 직렬화되어 있음)
+        siblings = (
+            FacetCount.objects.filter(category__parent_id__in=list(paths))
+            .exclude(category_id__in=list(paths))
+            .values_list("category__parent__path", "facet", "value", "count")
+        )
+
+        for parent_path, facet, value, n in siblings:
+            for ancestor_id in _ancestor_ids(parent_path):
+                totals[(facet, ancestor_id, value)] += n
+
+    labels = _labels()
+
+    _replace(
+        FacetCount.objects.filter(category_id__in=list(paths)),
+        [
+            FacetCount(
+                category_id=category_id,
+                facet=facet,
+                value=value,
+                label=labels.get((facet, value), ""),
+                count=n,
+            )
+            for (facet, category_id, value), n in totals.items()
+        ],
+    )
+
+    # 🔹 전체 합계 = 1차 카테고리 합
+    # (다른 1차 카테고리 재계산이 끝난 뒤의 값으로 합산되도록 lock 이후에 조회)
+    _lock([GLOBAL_FACET_LOCK])
+
+    _replace(
+        FacetCount.objects.filter(category__isnull=True),
+        [
+            FacetCount(
+                category_id=None, facet=facet, value=value, label=label, count=total
+            )
+            for facet, value, label, total in FacetCount.objects.filter(
+                category__depth=0
+            )
+            .values_list("facet", "value", "label")
+            .annotate(total=Sum("count"))
+            .order_by()
+        ],
+    )
+
+    # importer 는 청크 커밋 때 이미 버전을 올렸지만 그 사이 요청이 이전 facet 으로
+    # 페이지를 다시 채웠을 수 있으므로 집계가 커밋된 뒤 한 번 더
+    refreshed_ids = list(paths)
+    transaction.on_commit(lambda: bump_category_versions(refreshed_ids))
+
+    return len(totals)
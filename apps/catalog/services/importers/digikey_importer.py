@@ -1,12 +1,11 @@
-from apps.catalog.services.import_schema import ExternalProductSchema
-from apps.catalog.services.external_api.digikey_api import (
-    search_products,
-    normalize_products,
-)
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from apps.catalog.services.external_api.digikey_api import iter_search_pages
 
 from apps.catalog.models import (
     Product,
-    Category,
     ProductVariant,
     Warehouse,
     StockLedger,
@@ -15,29 +14,28 @@ from apps.catalog.models import (
     SupplierProduct,
 )
 
+from django.conf import settings
 from django.utils.text import slugify
 
 from apps.catalog.services.base_importer import NormalizedItem
-from apps.catalog.services.importers.upsert_engine import upsert_product
-
-category_cache = {}
-
-from apps.catalog.services.external_api.digikey_api import (
-    search_products,
-    normalize_products,
+from apps.catalog.services.importers.upsert_engine import (
+    UpsertResult,
+    bulk_upsert_products,
+    upsert_product,
+)
+from apps.catalog.services.facet_engine import refresh_facet_counts
+from apps.catalog.services.category_paths import (
+    normalize_path,
+    resolve_category_paths,
 )
 
-from apps.catalog.services.base_importer import NormalizedItem
-from apps.catalog.services.importers.upsert_engine import upsert_product
-
-
-def fetch_and_transform(keyword):
-    raw_json = search_products(keyword)
-    normalized = normalize_products(raw_json)
 
+def to_normalized_items(products):
     items = []
 
-    for item in normalized:
+    for item in products:
+        category_path = item.get("category_path") or ["Digikey"]
+
         data = NormalizedItem(
             supplier_code="digikey",
             supplier_part_number=item["dk_part"],
@@ -47,8 +45,10 @@ def fetch_and_transform(keyword):
             price=item.get("price") or 0,
             stock=item.get("stock") or 0,
             url=item.get("url") or "",
-            category_path=item.get("category_path") or ["Digikey"],
+            # 몰 1차 카테고리 아래에 Digi-Key 카테고리 경로
+            category_path=[map_to_root_category(category_path)] + category_path,
             image_url=item.get("image"),
+            currency=settings.DIGIKEY_CURRENCY,
         )
 
         items.append(data)
@@ -56,14 +56,159 @@ def fetch_and_transform(keyword):
     return items
 
 
-def run_import(keyword):
-    items = fetch_and_transform(keyword)
+def iter_fetch_pages(keyword, limit=None):
+    """키워드 검색 결과를 페이지 단위 NormalizedItem 목록으로 (최대 limit건)"""
+    limit = limit or settings.DIGIKEY_RESULTS_PER_KEYWORD
+
+    for products in iter_search_pages(keyword, limit, settings.DIGIKEY_PAGE_SIZE):
+        yield to_normalized_items(products)
+
+
+def fetch_and_transform(keyword, limit=None):
+    return [item for page in iter_fetch_pages(keyword, limit) for item in page]
+
+
+def prefetched(pages):
+    """
+    다음 페이지를 백그라운드 스레드에서 미리 조회
+    (현재 페이지를 저장하는 동안 다음 요청이 진행, 메모리에는 최대 2페이지)
+    """
+    pages = iter(pages)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(next, pages, None)
+
+        while (page := future.result()) is not None:
+            future = pool.submit(next, pages, None)
+            yield page
+
+
+def _merge(total, result):
+    total.created += result.created
+    total.updated += result.updated
+    total.unchanged += result.unchanged
+    total.truncated_paths += result.truncated_paths
+    total.no_rate += result.no_rate
+    total.missing_currencies |= result.missing_currencies
+    total.product_ids |= result.product_ids
+    total.category_ids |= result.category_ids
+
+
+def report_missing_rates(total):
+    # 환율 미등록 통화 항목은 저장하지 않음 (0원 판매가 방지)
+    for currency in sorted(total.missing_currencies):
+        print(
+            f"SKIPPED: no FX rate for {currency} "
+            f"(register with: manage.py convert_prices --rate {currency}=<KRW>)"
+        )
+
+    if total.no_rate:
+        print("skipped items (no FX rate):", total.no_rate)
+
+
+def run_import(keyword, limit=None):
+    total = UpsertResult()
+    count = 0
+
+    # 🔥 페이지 단위 일괄 upsert (다음 페이지는 저장 중에 미리 조회)
+    for items in prefetched(iter_fetch_pages(keyword, limit)):
+        count += len(items)
+        _merge(total, bulk_upsert_products(items))
+
+    print("items count:", count)
+    print(
+        "created:",
+        total.created,
+        "updated:",
+        total.updated,
+        "unchanged:",
+        total.unchanged,
+        "truncated category paths:",
+        total.truncated_paths,
+    )
+    report_missing_rates(total)
+
+    # 🔥 facet 집계 갱신 (가져온 상품의 카테고리 하위만)
+    if total.category_ids:
+        refresh_facet_counts(total.category_ids)
+
+    return total
+
 
-    print("items count:", len(items))  # 🔥 추가
+# 동시에 진행할 Digi-Key 키워드 조회 수 (--concurrency 기본값)
+DEFAULT_FETCH_CONCURRENCY = 4
 
-    for item in items:
-        print("importing:", item.name)  # 🔥 추가
-        upsert_product(item)
+# 조회 끝났지만 아직 저장 안 된 페이지 수 한도 (키워드 조회 스레드당)
+PAGE_QUEUE_PER_WORKER = 2
+
+
+def run_concurrent_import(keywords, concurrency=DEFAULT_FETCH_CONCURRENCY, limit=None):
+    """
+    키워드 여러 개 import
+    Digi-Key 조회는 스레드 풀에서 동시에, DB 쓰기는 호출한 스레드 하나에서 페이지 도착 순서대로
+    (작업 스레드는 DB에 접근하지 않음, 대기 페이지 수는 큐 크기로 제한)
+    """
+    concurrency = max(1, concurrency)
+    pages = queue.Queue(maxsize=concurrency * PAGE_QUEUE_PER_WORKER)
+    stop = threading.Event()
+
+    def put(message):
+        # 저장 쪽이 중단되면 더 기다리지 않음
+        while not stop.is_set():
+            try:
+                pages.put(message, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def fetch(keyword):
+        try:
+            for items in iter_fetch_pages(keyword, limit):
+                if stop.is_set():
+                    return
+                put((keyword, items, None))
+            put((keyword, None, None))
+        except Exception as e:
+            put((keyword, None, e))
+
+    total = UpsertResult()
+    failed = []
+    counts = {}
+    remaining = len(keywords)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for keyword in keywords:
+            pool.submit(fetch, keyword)
+
+        try:
+            while remaining:
+                keyword, items, error = pages.get()
+
+                if error is not None:
+                    print("FAILED:", keyword, error)
+                    failed.append(keyword)
+                    remaining -= 1
+                    continue
+
+                if items is None:
+                    print(f"IMPORTED: {keyword} (items {counts.get(keyword, 0)})")
+                    remaining -= 1
+                    continue
+
+                result = bulk_upsert_products(items)
+                counts[keyword] = counts.get(keyword, 0) + len(items)
+
+                _merge(total, result)
+        finally:
+            stop.set()
+
+    report_missing_rates(total)
+
+    # 🔥 facet 집계는 마지막에 한 번
+    if total.category_ids:
+        refresh_facet_counts(total.category_ids)
+
+    return total, failed
 
 
 def ensure_default_warehouse():
@@ -96,29 +241,6 @@ def map_to_root_category(category_path):
     return "전자/전기 부품"
 
 
-def ensure_category_tree(category_path):
-    parent = None
-    path_key = " > ".join(category_path)
-
-    if path_key in category_cache:
-        return category_cache[path_key]
-
-    for level_name in category_path:
-        slug_base = slugify(level_name)[:50]
-
-        category, _ = Category.objects.get_or_create(
-            name=level_name,
-            parent=parent,
-            defaults={"slug": slug_base},
-        )
-
-        parent = category
-
-    category_cache[path_key] = parent
-
-    return parent
-
-
 def save_products(products):
     electronics_mall, _ = Mall.objects.get_or_create(
         code="electronics",
@@ -127,16 +249,20 @@ def save_products(products):
 
     supplier = Supplier.objects.get(code="digikey")
 
+    # 🔥 카테고리 경로는 한 번에 조회/생성
+    paths = {
+        p.external_id: [map_to_root_category(p.category_path)] + (p.category_path or [])
+        for p in products
+        if p.external_id
+    }
+    categories = resolve_category_paths(paths.values())
+
     for p in products:
 
         if not p.external_id:
             continue
 
-        root_name = map_to_root_category(p.category_path)
-
-        full_path = [root_name] + (p.category_path or [])
-
-        category = ensure_category_tree(full_path)
+        category_id = categories[normalize_path(paths[p.external_id])]
 
         slug_base = slugify(p.name or "product")[:40]
 
@@ -150,7 +276,7 @@ def save_products(products):
                 "name": p.name or "No Name",
                 "slug": slug,
                 "serial_number": p.external_id,
-                "category": category,
+                "category_id": category_id,
                 "brand": p.brand or "",
                 "price": int(p.price or 0),
                 "short_description": p.description or "",
@@ -1,6 +1,26 @@
+import hashlib
+from dataclasses import astuple, dataclass, field
+
+import orjson
+from django.conf import settings
 from django.db import transaction
 from django.utils.text import slugify
 
+from apps.catalog.services.category_paths import (
+    is_truncated,
+    normalize_path,
+    resolve_category_paths,
+)
+from apps.catalog.services.currency import get_rates, to_krw
+from apps.catalog.services.offer_summary import (
+    refresh_canonical_offers,
+    refresh_offer_summaries,
+)
+from apps.catalog.services.page_cache import bump_category_versions
+from apps.catalog.services.part_number import normalize_part_number
+from apps.catalog.services.price_engine import invalidate_price_comparison
+from apps.catalog.services.price_history import record_price_changes
+from apps.catalog.services.search_engine import refresh_search_vectors
 from apps.catalog.models import (
     Product,
     Supplier,
@@ -24,29 +44,131 @@ def ensure_default_category():
     return category
 
 
+def image_url(item):
+    """목록 썸네일 대체용 외부 이미지 (Product.image_url 길이 초과 URL은 저장 안 함)"""
+    url = item.image_url or ""
+    max_length = Product._meta.get_field("image_url").max_length
+
+    return url if len(url) <= max_length else ""
+
+
+def _slug_candidate(base, n, max_length):
+    if n == 1:
+        return base[:max_length]
+
+    suffix = f"-{n}"
+    return base[: max_length - len(suffix)] + suffix
+
+
+def unique_slugs(bases):
+    """
+    bases: {serial_number: slug} → {serial_number: 중복 없는 slug}
+    다른 상품(DB)이나 같은 배치의 다른 항목이 쓰는 slug 면 -2, -3 ... 을 붙임
+    (bulk_create 한 번에 slug unique 충돌로 청크 전체가 실패하지 않도록)
+    """
+    max_length = Product._meta.get_field("slug").max_length
+    suffixes = dict.fromkeys(bases, 1)
+    slugs = {}
+    used = set()
+    pending = sorted(bases)
+
+    while pending:
+        candidates = {
+            serial: _slug_candidate(bases[serial], suffixes[serial], max_length)
+            for serial in pending
+        }
+        owners = dict(
+            Product.objects.filter(slug__in=set(candidates.values())).values_list(
+                "slug", "serial_number"
+            )
+        )
+
+        retry = []
+
+        for serial in pending:
+            slug = candidates[serial]
+
+            if slug in used or owners.get(slug, serial) != serial:
+                suffixes[serial] += 1
+                retry.append(serial)
+                continue
+
+            slugs[serial] = slug
+            used.add(slug)
+
+        pending = retry
+
+    return slugs
+
+
+# 저장하는 필드가 늘면 올림 → 기존 해시가 모두 달라져 다음 import에서 한 번 다시 씀
+# 2: Product.image_url
+CONTENT_HASH_VERSION = 2
+
+
+def content_hash(item, rates):
+    """
+    NormalizedItem 전체 필드 + 적용 환율 해시 (SupplierProduct.content_hash)
+    환율이 바뀌면 원화 가격(price_krw / Product.price)도 바뀌므로 다시 쓰도록
+    """
+    rate = rates.get((item.currency or "KRW").upper())
+    data = orjson.dumps([CONTENT_HASH_VERSION, astuple(item), rate])
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _resolve_categories(paths):
+    # 경로별 분류를 끄면 {} → 모두 미분류 (CATALOG_IMPORT_CATEGORY_PATHS)
+    if not settings.CATALOG_IMPORT_CATEGORY_PATHS:
+        return {}
+
+    return resolve_category_paths(paths)
+
+
 @transaction.atomic
 def upsert_product(item):
+    """
+    단건 upsert → Product (환율 미등록 통화의 신규 상품은 만들지 않고 None)
+    건너뛴 건수는 호출 측이 집계 (bulk 경로는 UpsertResult.no_rate)
+    """
     supplier = ensure_supplier(item.supplier_code)
 
-    category = ensure_default_category()
+    category_id = _resolve_categories([item.category_path]).get(
+        normalize_path(item.category_path)
+    )
+    if category_id is None:
+        category_id = ensure_default_category().pk
 
     slug_base = slugify(item.name or "product")[:40]
 
-    slug = f"{slug_base}-{item.supplier_part_number.lower()}"
+    slug = unique_slugs(
+        {item.supplier_part_number: f"{slug_base}-{item.supplier_part_number.lower()}"}
+    )[item.supplier_part_number]
+
+    # Product.price 는 원화 판매가 → 환율 미등록 통화는 쓰지 않음 (기존 가격 유지)
+    price_krw = to_krw(item.price or 0, item.currency)
+
+    defaults = {
+        "manufacturer": item.manufacturer or "",
+        "mpn": item.mpn or item.supplier_part_number,
+        "name": item.name or "No Name",
+        "slug": slug,
+        "category_id": category_id,
+        "brand": item.manufacturer or "",
+        "short_description": "",
+        "image_url": image_url(item),
+        "is_active": True,
+    }
+
+    if price_krw is None:
+        if not Product.objects.filter(serial_number=item.supplier_part_number).exists():
+            return None
+    else:
+        defaults["price"] = int(price_krw)
 
     product, _ = Product.objects.update_or_create(
         serial_number=item.supplier_part_number,
-        defaults={
-            "manufacturer": item.manufacturer or "",
-            "mpn": item.mpn or item.supplier_part_number,
-            "name": item.name or "No Name",
-            "slug": slug,
-            "category": category,
-            "brand": item.manufacturer or "",
-            "price": int(item.price or 0),
-            "short_description": "",
-            "is_active": True,
-        },
+        defaults=defaults,
     )
 
     SupplierProduct.objects.update_or_create(
@@ -55,9 +177,252 @@ def upsert_product(item):
         defaults={
             "product": product,
             "price": float(item.price or 0),
+            "currency": item.currency,
             "stock": int(item.stock or 0),
             "url": item.url or "",
+            "content_hash": content_hash(item, get_rates()),
         },
     )
 
     return product
+
+
+# bulk_upsert_products 청크 크기 (청크마다 트랜잭션 1개)
+BULK_UPSERT_CHUNK_SIZE = 500
+
+PRODUCT_UPDATE_FIELDS = [
+    "manufacturer",
+    "mpn",
+    "mpn_key",
+    "name",
+    "slug",
+    "category",
+    "brand",
+    "price",
+    "short_description",
+    "image_url",
+    "is_active",
+    "updated_at",
+]
+
+OFFER_UPDATE_FIELDS = [
+    "product",
+    "part_key",
+    "price",
+    "currency",
+    "price_krw",
+    "stock",
+    "url",
+    "content_hash",
+    "updated_at",
+]
+
+
+@dataclass
+class UpsertResult:
+    created: int = 0  # 새 오퍼
+    updated: int = 0  # 내용이 바뀐 오퍼
+    unchanged: int = 0  # 해시가 같아 쓰기 생략
+    truncated_paths: int = 0  # 카테고리 5단계 초과로 하위 단계가 잘린 항목
+    no_rate: int = 0  # 환율 미등록 통화라 건너뛴 항목
+    missing_currencies: set = field(default_factory=set)
+    product_ids: set = field(default_factory=set)
+    category_ids: set = field(default_factory=set)
+
+
+def ensure_suppliers(codes):
+    """공급처 일괄 조회/생성 → {code: Supplier}"""
+    codes = set(codes)
+
+    Supplier.objects.bulk_create(
+        [Supplier(code=code, name=code) for code in codes], ignore_conflicts=True
+    )
+
+    return {
+        supplier.code: supplier for supplier in Supplier.objects.filter(code__in=codes)
+    }
+
+
+def bulk_upsert_products(items, chunk_size=BULK_UPSERT_CHUNK_SIZE):
+    """
+    NormalizedItem 목록 일괄 upsert (upsert_product의 set 기반 버전)
+    공급처/카테고리 경로/환율은 한 번만 조회, 청크마다
+    Product / SupplierProduct bulk_create(update_conflicts=True) 각 1회
+    content_hash가 저장된 값과 같은 항목은 쓰지 않음 (updated_at/캐시 유지)
+    환율 미등록 통화 항목도 쓰지 않음 (0원 판매가 방지, 기존 상품은 이전 가격 유지)
+    save()/시그널을 거치지 않으므로 파생 데이터 갱신을 직접 호출
+    """
+    # 같은 공급처 부품번호가 여러 번 오면 마지막 값 사용
+    items = list(
+        {
+            (item.supplier_code, item.supplier_part_number): item for item in items
+        }.values()
+    )
+
+    result = UpsertResult()
+
+    if not items:
+        return result
+
+    suppliers = ensure_suppliers(item.supplier_code for item in items)
+    rates = get_rates()
+
+    # 🔥 기존 오퍼 해시 한 번에 조회 → 새 항목 / 바뀐 항목만 쓰기
+    # (기존 카테고리도 함께: 카테고리가 바뀌면 이전 카테고리 목록/facet도 갱신)
+    stored = {
+        (supplier_id, part_number): (digest, category_id)
+        for supplier_id, part_number, digest, category_id in (
+            SupplierProduct.objects.filter(
+                supplier__in=suppliers.values(),
+                supplier_part_number__in={item.supplier_part_number for item in items},
+            ).values_list(
+                "supplier_id",
+                "supplier_part_number",
+                "content_hash",
+                "product__category_id",
+            )
+        )
+    }
+
+    changed = []
+    previous_categories = set()
+
+    for item in items:
+        currency = (item.currency or "KRW").upper()
+
+        if currency not in rates:
+            result.no_rate += 1
+            result.missing_currencies.add(currency)
+            continue
+
+        digest = content_hash(item, rates)
+        key = (suppliers[item.supplier_code].pk, item.supplier_part_number)
+
+        if key not in stored:
+            result.created += 1
+        elif stored[key][0] != digest:
+            result.updated += 1
+            previous_categories.add(stored[key][1])
+        else:
+            result.unchanged += 1
+            continue
+
+        changed.append((item, digest))
+
+    if not changed:
+        return result
+
+    result.truncated_paths += sum(
+        is_truncated(item.category_path) for item, _ in changed
+    )
+
+    # 🔥 배치의 카테고리 경로를 한 번에 조회/생성 (경로 없으면 미분류)
+    categories = _resolve_categories(item.category_path for item, _ in changed)
+    default_category_id = ensure_default_category().pk
+
+    result.category_ids |= previous_categories
+
+    for start in range(0, len(changed), chunk_size):
+        _upsert_chunk(
+            changed[start : start + chunk_size],
+            suppliers,
+            categories,
+            default_category_id,
+            rates,
+            result,
+        )
+
+    return result
+
+
+@transaction.atomic
+def _upsert_chunk(items, suppliers, categories, default_category_id, rates, result):
+    # Product.serial_number = 공급처 부품번호 (upsert_product와 동일)
+    products = {}
+
+    for item, _digest in items:
+        slug_base = slugify(item.name or "product")[:40]
+        mpn = item.mpn or item.supplier_part_number
+
+        products[item.supplier_part_number] = Product(
+            serial_number=item.supplier_part_number,
+            manufacturer=item.manufacturer or "",
+            mpn=mpn,
+            mpn_key=normalize_part_number(mpn),
+            name=item.name or "No Name",
+            slug=f"{slug_base}-{item.supplier_part_number.lower()}",
+            category_id=categories.get(
+                normalize_path(item.category_path), default_category_id
+            ),
+            brand=item.manufacturer or "",
+            price=int(to_krw(item.price or 0, item.currency, rates)),
+            short_description="",
+            image_url=image_url(item),
+            is_active=True,
+        )
+
+    slugs = unique_slugs({serial: product.slug for serial, product in products.items()})
+    for serial, product in products.items():
+        product.slug = slugs[serial]
+
+    # PostgreSQL: update_conflicts 여도 RETURNING으로 pk가 채워짐
+    Product.objects.bulk_create(
+        list(products.values()),
+        update_conflicts=True,
+        unique_fields=["serial_number"],
+        update_fields=PRODUCT_UPDATE_FIELDS,
+    )
+
+    offers = SupplierProduct.objects.bulk_create(
+        [
+            SupplierProduct(
+                supplier=suppliers[item.supplier_code],
+                supplier_part_number=item.supplier_part_number,
+                part_key=normalize_part_number(item.supplier_part_number),
+                product=products[item.supplier_part_number],
+                price=float(item.price or 0),
+                currency=(item.currency or "KRW").upper(),
+                price_krw=to_krw(item.price or 0, item.currency, rates),
+                stock=int(item.stock or 0),
+                url=item.url or "",
+                content_hash=digest,
+            )
+            for item, digest in items
+        ],
+        update_conflicts=True,
+        unique_fields=["supplier", "supplier_part_number"],
+        update_fields=OFFER_UPDATE_FIELDS,
+    )
+
+    product_ids = [product.pk for product in products.values()]
+
+    result.product_ids.update(product_ids)
+    result.category_ids.update(product.category_id for product in products.values())
+
+    refresh_derived_data(product_ids, offers, result.category_ids)
+
+
+def refresh_derived_data(product_ids, offers=(), previous_category_ids=()):
+    """
+    bulk 쓰기 이후 시그널 대신 호출하는 파생 데이터 갱신
+    (검색 벡터, 최저가 요약, 대표상품 최저가, 가격 이력, 가격비교/목록 캐시)
+    previous_category_ids: 상품이 빠져나간 카테고리 (목록 캐시 갱신 대상)
+    """
+    product_ids = list(product_ids)
+
+    linked = Product.objects.filter(pk__in=product_ids).values_list(
+        "category_id", "canonical_id"
+    )
+    category_ids = {category_id for category_id, _ in linked}
+    category_ids.update(pk for pk in previous_category_ids if pk)
+    canonical_ids = {canonical_id for _, canonical_id in linked if canonical_id}
+
+    refresh_search_vectors(product_ids)
+    refresh_offer_summaries(product_ids)
+    refresh_canonical_offers(canonical_ids)
+    record_price_changes(offers)
+
+    transaction.on_commit(
+        lambda: invalidate_price_comparison(product_ids, canonical_ids)
+    )
+    transaction.on_commit(lambda: bump_category_versions(category_ids))
@@ -1,9 +1,15 @@
 from apps.catalog.models import Product, CanonicalProduct
+from apps.catalog.services.offer_summary import refresh_canonical_offers
 
 
 def unify_products_by_mpn():
     products = Product.objects.exclude(mpn="").exclude(manufacturer="")
 
+    # 연결이 끊긴 이전 대표상품도 다시 계산해야 함
+    canonical_ids = set(
+        products.exclude(canonical__isnull=True).values_list("canonical_id", flat=True)
+    )
+
     for p in products:
         canonical, _ = CanonicalProduct.objects.get_or_create(
             manufacturer=p.manufacturer.lower().strip(),
@@ -17,3 +23,6 @@ def unify_products_by_mpn():
 
         p.canonical = canonical
         p.save(update_fields=["canonical"])
+        canonical_ids.add(canonical.pk)
+
+    refresh_canonical_offers(canonical_ids)
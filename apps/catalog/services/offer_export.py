@@ -0,0 +1,157 @@
+import csv
+import itertools
+from datetime import timedelta
+
+import orjson
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.catalog.models import OfferTombstone, Product, SupplierProduct
+
+# 서버 사이드 커서에서 한 번에 가져올 행 수
+EXPORT_CHUNK_SIZE = 2000
+
+# 출력 컬럼 → 조회 필드 (상품 1행 × 오퍼 N행, 오퍼 없는 상품은 오퍼 컬럼 비움)
+EXPORT_FIELDS = {
+    "product_id": "pk",
+    "slug": "slug",
+    "name": "name",
+    "manufacturer": "manufacturer",
+    "mpn": "mpn",
+    "category": "category__name",
+    "is_active": "is_active",
+    "product_updated_at": "updated_at",
+    "supplier": "supplier_products__supplier__code",
+    "supplier_part_number": "supplier_products__supplier_part_number",
+    "price": "supplier_products__price",
+    "currency": "supplier_products__currency",
+    "price_krw": "supplier_products__price_krw",
+    "stock": "supplier_products__stock",
+    "url": "supplier_products__url",
+    "offer_updated_at": "supplier_products__updated_at",
+}
+
+# 받는 쪽에서 지울 행 표시 (비활성 상품 행, 삭제 기록 행)
+DELETED_COLUMN = "deleted"
+
+EXPORT_COLUMNS = [*EXPORT_FIELDS, DELETED_COLUMN]
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def export_watermark():
+    """
+    다음 증분 export 의 since 값
+    updated_at 은 커밋 전에 찍히므로 조회 시작 시각을 그대로 쓰면, 그 직전에 쓰고
+    export 이후에 커밋된 행이 다음 export 에서도 빠짐
+    → CATALOG_EXPORT_OVERLAP_SECONDS 만큼 앞당김 (겹치는 구간의 행은 다시 나오므로
+    받는 쪽에서 product_id + supplier + supplier_part_number 기준으로 중복 제거)
+    """
+    return timezone.now() - timedelta(seconds=settings.CATALOG_EXPORT_OVERLAP_SECONDS)
+
+
+def iter_offer_rows(since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    전체 상품 + 오퍼 행 (메모리 사용량 고정: iterator 서버 사이드 커서)
+    since: 이 시각 이후 변경된 상품(전체 오퍼) 또는 오퍼만
+    비활성 상품 행은 deleted=True
+    """
+    rows = Product.objects.order_by("pk", "supplier_products__id")
+
+    if since is not None:
+        rows = rows.filter(
+            Q(updated_at__gt=since) | Q(supplier_products__updated_at__gt=since)
+        )
+
+    columns = list(EXPORT_FIELDS)
+
+    for values in rows.values_list(*EXPORT_FIELDS.values()).iterator(
+        chunk_size=chunk_size
+    ):
+        row = dict(zip(columns, values))
+        row[DELETED_COLUMN] = not row["is_active"]
+        yield row
+
+
+def iter_tombstone_rows(since, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    since 이후 삭제된 오퍼 / 상품 (다른 상품으로 옮겨진 오퍼의 이전 행 포함)
+    같은 키로 다시 생긴 오퍼는 제외 ― 증분 export 에서 일반 행보다 먼저 내보냄
+    """
+    live = SupplierProduct.objects.filter(
+        product_id=OuterRef("product_id"),
+        supplier__code=OuterRef("supplier"),
+        supplier_part_number=OuterRef("supplier_part_number"),
+    )
+
+    rows = (
+        OfferTombstone.objects.filter(deleted_at__gt=since)
+        .exclude(Exists(live))
+        .order_by("deleted_at", "pk")
+        .values_list("product_id", "supplier", "supplier_part_number", "deleted_at")
+    )
+
+    for product_id, supplier, part_number, deleted_at in rows.iterator(
+        chunk_size=chunk_size
+    ):
+        row = dict.fromkeys(EXPORT_COLUMNS)
+        row.update(
+            product_id=product_id,
+            supplier=supplier or None,
+            supplier_part_number=part_number or None,
+            offer_updated_at=deleted_at,
+            deleted=True,
+        )
+        yield row
+
+
+def prune_tombstones(oldest_since):
+    """
+    oldest_since: 받는 쪽들이 아직 쓰는 가장 오래된 since (워터마크)
+    그보다 CATALOG_EXPORT_OVERLAP_SECONDS 더 이전에 삭제된 기록은 어떤 증분 export 에도
+    다시 나오지 않으므로 삭제 (deleted_at 인덱스 범위 DELETE 1회)
+    반환: 삭제한 행 수
+    """
+    cutoff = oldest_since - timedelta(seconds=settings.CATALOG_EXPORT_OVERLAP_SECONDS)
+    deleted, _ = OfferTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+
+    return deleted
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+
+class _Echo:
+    # csv.writer가 쓴 한 줄을 그대로 돌려받기 위한 버퍼
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+
+    yield writer.writerow(EXPORT_COLUMNS).encode()
+
+    for row in rows:
+        yield writer.writerow(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row.values()
+            ]
+        ).encode()
+
+
+def iter_export(fmt, since=None):
+    rows = iter_offer_rows(since)
+
+    # 증분 export: 삭제 기록을 먼저, 그다음 변경된 행
+    if since is not None:
+        rows = itertools.chain(iter_tombstone_rows(since), rows)
+
+    if fmt == "csv":
+        return iter_csv(rows)
+
+    return iter_ndjson(rows)
@@ -0,0 +1,57 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from apps.catalog.models import CanonicalProduct, Product, SupplierProduct
+
+# 원화 환산가 기준 (환율 미등록 통화 오퍼는 뒤로)
+BEST_OFFER_ORDER = (F("price_krw").asc(nulls_last=True), "id")
+
+
+def offer_summary_values():
+    offers = SupplierProduct.objects.filter(product_id=OuterRef("pk"))
+    best = offers.order_by(*BEST_OFFER_ORDER)
+    totals = offers.order_by().values("product_id")
+
+    return {
+        "best_price": Subquery(best.values("price_krw")[:1]),
+        "best_supplier_id": Subquery(best.values("supplier_id")[:1]),
+        "supplier_count": Coalesce(
+            Subquery(
+                totals.annotate(n=Count("supplier_id", distinct=True)).values("n")
+            ),
+            0,
+        ),
+        "total_stock": Coalesce(
+            Subquery(totals.annotate(n=Sum("stock")).values("n")), 0
+        ),
+    }
+
+
+def refresh_offer_summaries(product_ids):
+    """
+    Product 가격비교 요약(최저가/공급처 수/총재고/최저가 공급처) 재계산
+    product_ids: id 리스트 또는 values("pk") 서브쿼리, UPDATE 1회
+    """
+    return Product.objects.filter(pk__in=product_ids).update(**offer_summary_values())
+
+
+def refresh_canonical_offers(canonical_ids):
+    """
+    CanonicalProduct 최저가 오퍼 재계산 (연결된 모든 Product의 SupplierProduct 기준)
+    canonical_ids: id 리스트 또는 values("pk") 서브쿼리, UPDATE 1회
+    """
+    offers = SupplierProduct.objects.filter(product__canonical_id=OuterRef("pk"))
+    best = offers.order_by(*BEST_OFFER_ORDER)
+    totals = offers.order_by().values("product__canonical_id")
+
+    return CanonicalProduct.objects.filter(pk__in=canonical_ids).update(
+        best_offer_id=Subquery(best.values("pk")[:1]),
+        best_price=Subquery(best.values("price_krw")[:1]),
+        offer_count=Coalesce(Subquery(totals.annotate(n=Count("id")).values("n")), 0),
+        supplier_count=Coalesce(
+            Subquery(
+                totals.annotate(n=Count("supplier_id", distinct=True)).values("n")
+            ),
+            0,
+        ),
+    )
@@ -0,0 +1,124 @@
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from apps.cart.context_processors import CART_COUNT_PLACEHOLDER, get_cart_count
+from apps.catalog.services.cache_stats import record_hit, record_miss
+from apps.catalog.services.category_tree import get_category_tree, get_tree_version
+
+PAGE_CACHE_KEY = "catalog:page:{digest}"
+SUBTREE_VERSION_KEY = "catalog:subtree_version:{scope}"
+
+# 전체 상품 목록(home) 버전 ― 모든 상품 변경 시 갱신
+ALL_SCOPE = "all"
+
+
+def get_subtree_version(scope):
+    key = SUBTREE_VERSION_KEY.format(scope=scope)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_category_versions(category_ids):
+    """
+    해당 카테고리와 모든 상위 카테고리, 전체 목록의 버전 갱신
+    (상위 카테고리 목록에도 하위 상품이 보이므로)
+    """
+    tree = get_category_tree()
+    scopes = {ALL_SCOPE}
+
+    for pk in category_ids:
+        node = tree.get(pk)
+
+        if node is None:
+            scopes.add(pk)
+            continue
+
+        scopes.update(int(a) for a in node.path.strip("/").split("/") if a)
+
+    token = uuid.uuid4().hex
+
+    cache.set_many(
+        {SUBTREE_VERSION_KEY.format(scope=scope): token for scope in scopes}, None
+    )
+
+
+def page_cache_key(request, scope):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+
+    # 카테고리 트리(네비게이션) 버전 + 해당 subtree 버전
+    raw = "|".join(
+        [
+            request.path,
+            query,
+            str(get_tree_version()),
+            str(get_subtree_version(scope)),
+        ]
+    )
+
+    return PAGE_CACHE_KEY.format(digest=hashlib.md5(raw.encode()).hexdigest())
+
+
+def _fill_cart_count(request, content):
+    return content.replace(
+        CART_COUNT_PLACEHOLDER.encode(), str(get_cart_count(request)).encode()
+    )
+
+
+def anonymous_page_cache(scope_func):
+    """
+    비로그인 GET 요청 전체 페이지 캐시
+    scope_func(request, *args, **kwargs) → 카테고리 id (None 이면 전체 목록)
+    장바구니 수량은 캐시에서 제외하고 응답 시 채움
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET" or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            scope = scope_func(request, *args, **kwargs) or ALL_SCOPE
+            key = page_cache_key(request, scope)
+
+            cached = cache.get(key)
+
+            if cached is not None:
+                record_hit("page")
+                content, content_type = cached
+                return HttpResponse(
+                    _fill_cart_count(request, content), content_type=content_type
+                )
+
+            record_miss("page")
+
+            request.defer_cart_count = True
+            response = view_func(request, *args, **kwargs)
+
+            if response.streaming:
+                return response
+
+            if response.status_code == 200:
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    settings.CATALOG_PAGE_CACHE_TIMEOUT,
+                )
+
+            response.content = _fill_cart_count(request, response.content)
+
+            return response
+
+        return wrapper
+
+    return decorator
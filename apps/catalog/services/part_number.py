@@ -0,0 +1,68 @@
+import re
+
+NON_ALNUM = re.compile(r"[^0-9A-Z]")
+
+# Digi-Key 부품번호 접미사 (예: 497-6063-ND)
+DIGIKEY_SUFFIX = re.compile(r"-ND$", re.IGNORECASE)
+
+# 제조사 비교 시 단어 구분으로 보는 문자 (공백/구두점)
+NON_WORD = re.compile(r"[\W_]+")
+
+# 제조사 비교 시 끝에서부터 무시하는 법인 표기 (Co., Ltd. 처럼 여러 개면 모두)
+CORPORATE_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "corp",
+    "corporation",
+    "co",
+    "company",
+    "ltd",
+    "limited",
+    "llc",
+    "plc",
+    "gmbh",
+    "ag",
+    "sa",
+    "nv",
+    "bv",
+    "kk",
+    "주식회사",
+}
+
+# prefix / 부분일치 검색을 허용하는 최소 키 길이
+MIN_PARTIAL_KEY_LENGTH = 4
+
+
+def normalize_part_number(value):
+    """
+    부품번호 비교용 키
+    STM32F103-C8T6 / stm32f103c8t6 / STM32F103 C8T6 → STM32F103C8T6
+    """
+    value = (value or "").strip().upper()
+    value = DIGIKEY_SUFFIX.sub("", value)
+    return NON_ALNUM.sub("", value)
+
+
+def normalize_manufacturer(value):
+    """
+    제조사 비교용 키 (대소문자 / 공백 / 구두점 / 끝의 법인 표기 무시)
+    Texas Instruments Inc. / TEXAS INSTRUMENTS, INCORPORATED → texasinstruments
+    """
+    words = [word for word in NON_WORD.split((value or "").casefold()) if word]
+
+    while len(words) > 1 and words[-1] in CORPORATE_SUFFIXES:
+        words.pop()
+
+    return "".join(words)
+
+
+def is_part_number_query(q):
+    # 공백 없는 단일 토큰 + 숫자 포함일 때만 부품번호로 취급
+    q = (q or "").strip()
+
+    if not q or len(q.split()) != 1:
+        return False
+
+    key = normalize_part_number(q)
+
+    return len(key) >= 3 and any(ch.isdigit() for ch in key)
@@ -1,24 +1,112 @@
-from apps.catalog.models import SupplierProduct
+from django.core.cache import cache
 
+from apps.catalog.models import SupplierProduct
+from apps.catalog.services.cache_stats import record_hit, record_miss
+from apps.catalog.services.offer_summary import BEST_OFFER_ORDER
 
-def get_price_comparison(product):
-    suppliers = SupplierProduct.objects.filter(product=product)
+PRICE_CACHE_KEY = "catalog:price:{product_id}"
+CANONICAL_PRICE_CACHE_KEY = "catalog:price:canonical:{canonical_id}"
+PRICE_CACHE_TIMEOUT = 60 * 60 * 6
 
-    data = []
+OFFER_FIELDS = (
+    "product_id",
+    "supplier__name",
+    "supplier__code",
+    "supplier_part_number",
+    "price",
+    "currency",
+    "price_krw",
+    "stock",
+    "url",
+)
 
-    for sp in suppliers:
-        data.append(
-            {
-                "supplier": sp.supplier.name,
-                "price": sp.price,
-                "stock": sp.stock,
-                "url": sp.url,
-            }
-        )
 
-    data.sort(key=lambda x: x["price"])
+def _offer_rows(queryset):
+    data = [
+        {
+            "product_id": row["product_id"],
+            "supplier": row["supplier__name"],
+            "supplier_code": row["supplier__code"],
+            "part_number": row["supplier_part_number"],
+            "price": row["price_krw"],
+            "original_price": row["price"],
+            "currency": row["currency"],
+            "stock": row["stock"],
+            "url": row["url"],
+            "best": False,
+        }
+        for row in queryset.order_by(*BEST_OFFER_ORDER).values(*OFFER_FIELDS)
+    ]
 
     if data:
         data[0]["best"] = True
 
     return data
+
+
+def _cached(key, build):
+    data = cache.get(key)
+
+    if data is not None:
+        record_hit("price")
+        return data
+
+    record_miss("price")
+
+    data = build()
+    cache.set(key, data, PRICE_CACHE_TIMEOUT)
+
+    return data
+
+
+def build_price_comparison(product_id):
+    """공급처 조인 + DB 정렬 쿼리 1회"""
+    return _offer_rows(SupplierProduct.objects.filter(product_id=product_id))
+
+
+def build_canonical_price_comparison(canonical_id):
+    """
+    대표상품(CanonicalProduct)에 연결된 모든 Product의 오퍼 비교
+    공급처별 최저가 1건 (DISTINCT ON supplier) → 가격순, 쿼리 1회
+    """
+    best_per_supplier = (
+        SupplierProduct.objects.filter(product__canonical_id=canonical_id)
+        .order_by("supplier_id", *BEST_OFFER_ORDER)
+        .distinct("supplier_id")
+        .values("pk")
+    )
+
+    return _offer_rows(SupplierProduct.objects.filter(pk__in=best_per_supplier))
+
+
+def get_price_comparison(product):
+    """
+    상품별 가격비교 (최저가 순)
+    캐시 우선, SupplierProduct 변경 시 invalidate_price_comparison으로 삭제
+    """
+    product_id = getattr(product, "pk", product)
+
+    return _cached(
+        PRICE_CACHE_KEY.format(product_id=product_id),
+        lambda: build_price_comparison(product_id),
+    )
+
+
+def get_canonical_price_comparison(canonical):
+    canonical_id = getattr(canonical, "pk", canonical)
+
+    return _cached(
+        CANONICAL_PRICE_CACHE_KEY.format(canonical_id=canonical_id),
+        lambda: build_canonical_price_comparison(canonical_id),
+    )
+
+
+def invalidate_price_comparison(product_ids, canonical_ids=()):
+    cache.delete_many(
+        [PRICE_CACHE_KEY.format(product_id=pk) for pk in set(product_ids)]
+        + [
+            CANONICAL_PRICE_CACHE_KEY.format(canonical_id=pk)
+            for pk in set(canonical_ids)
+            if pk
+        ]
+    )
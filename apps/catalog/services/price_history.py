@@ -0,0 +1,264 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.catalog.models import PriceHistory, PriceHistoryDaily, SupplierProduct
+from apps.catalog.services.offer_summary import BEST_OFFER_ORDER
+
+_APPEND_SQL = """
+    INSERT INTO {table} AS h (offer_id, month, times, prices, stocks)
+    SELECT v.offer_id, %s, ARRAY[%s], ARRAY[v.price], ARRAY[v.stock]
+    FROM unnest(%s::bigint[], %s::double precision[], %s::integer[])
+        AS v(offer_id, price, stock)
+    ON CONFLICT (offer_id, month) DO UPDATE SET
+        times = array_append(h.times, EXCLUDED.times[1]),
+        prices = array_append(h.prices, EXCLUDED.prices[1]),
+        stocks = array_append(h.stocks, EXCLUDED.stocks[1])
+    WHERE h.prices[cardinality(h.prices)] IS DISTINCT FROM EXCLUDED.prices[1]
+        OR h.stocks[cardinality(h.stocks)] IS DISTINCT FROM EXCLUDED.stocks[1]
+"""
+
+# 같은 날 일별 행이 이미 있으면 범위는 합치고 종가는 새로 압축한 값
+# (압축 대상 원본이 그 날의 더 늦은 기록)
+_MERGE_DAILY_SQL = """
+    INSERT INTO {table} AS d
+        (offer_id, day, min_price, max_price, close_price, close_stock)
+    SELECT * FROM unnest(
+        %s::bigint[], %s::date[], %s::double precision[],
+        %s::double precision[], %s::double precision[], %s::integer[]
+    )
+    ON CONFLICT (offer_id, day) DO UPDATE SET
+        min_price = LEAST(d.min_price, EXCLUDED.min_price),
+        max_price = GREATEST(d.max_price, EXCLUDED.max_price),
+        close_price = EXCLUDED.close_price,
+        close_stock = EXCLUDED.close_stock
+"""
+
+
+def month_start(moment):
+    """(해당 월 1일, 월 시작 시각) ― 로컬 시간대 기준"""
+    month = timezone.localtime(moment).date().replace(day=1)
+    return month, timezone.make_aware(datetime.combine(month, time.min))
+
+
+def _points(row):
+    """PriceHistory 1행 → [(시각, 가격, 재고)]"""
+    start = timezone.make_aware(datetime.combine(row["month"], time.min))
+    return [
+        (start + timedelta(seconds=offset), price, stock)
+        for offset, price, stock in zip(row["times"], row["prices"], row["stocks"])
+    ]
+
+
+def _latest_points(offer_ids, before_month):
+    # 오퍼별 before_month 이전 마지막 기록 (DISTINCT ON offer)
+    # 원본 월 행이 없으면(이미 일별로 압축) 마지막 일별 종가 (시각은 그날 0시)
+    rows = (
+        PriceHistory.objects.filter(offer_id__in=offer_ids, month__lt=before_month)
+        .order_by("offer_id", "-month")
+        .distinct("offer_id")
+        .values("offer_id", "month", "times", "prices", "stocks")
+    )
+    points = {row["offer_id"]: _points(row)[-1] for row in rows}
+
+    missing = [pk for pk in offer_ids if pk not in points]
+
+    if missing:
+        for offer_id, day, price, stock in (
+            PriceHistoryDaily.objects.filter(offer_id__in=missing, day__lt=before_month)
+            .order_by("offer_id", "-day")
+            .distinct("offer_id")
+            .values_list("offer_id", "day", "close_price", "close_stock")
+        ):
+            moment = timezone.make_aware(datetime.combine(day, time.min))
+            points[offer_id] = (moment, price, stock)
+
+    return points
+
+
+def record_price_changes(offers, at=None):
+    """
+    오퍼 원화 환산가/재고가 마지막 기록과 다를 때만 이력 추가
+    (공급처 통화와 무관하게 같은 축으로 비교되도록 price_krw 기준, 환율 미등록 오퍼는 제외)
+    offers: SupplierProduct 목록 (pk, price_krw, stock)
+    이번 달 행에는 array_append UPDATE 로 추가 (마지막 값 비교도 SQL 에서)
+    → 같은 오퍼를 동시에 기록해도 서로 덮어쓰지 않음, INSERT ... ON CONFLICT 1회
+    반환: 기록된 오퍼 수
+    """
+    offers = {offer.pk: offer for offer in offers if offer.price_krw is not None}
+
+    if not offers:
+        return 0
+
+    at = at or timezone.now()
+    month, start = month_start(at)
+    offset = int((at - start).total_seconds())
+
+    # 이번 달 행이 아직 없으면 이전 달 마지막 기록과 같은 값은 건너뜀
+    existing = set(
+        PriceHistory.objects.filter(offer_id__in=list(offers), month=month).values_list(
+            "offer_id", flat=True
+        )
+    )
+    previous = _latest_points([pk for pk in offers if pk not in existing], month)
+
+    # offer_id 순서로 → 동시에 실행돼도 같은 순서로 행 잠금
+    values = [
+        (pk, offer.price_krw, offer.stock)
+        for pk, offer in sorted(offers.items())
+        if pk in existing
+        or pk not in previous
+        or previous[pk][1:] != (offer.price_krw, offer.stock)
+    ]
+
+    if not values:
+        return 0
+
+    ids, prices, stocks = zip(*values)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _APPEND_SQL.format(table=PriceHistory._meta.db_table),
+            [month, offset, list(ids), list(prices), list(stocks)],
+        )
+        return cursor.rowcount
+
+
+def get_price_history(product_id, start, end):
+    """
+    상품의 오퍼별 가격 이력 (차트용, 원화 환산가), start/end: aware datetime
+    반환: [{"offer_id", "supplier", "points": [[epoch ms, price, stock]],
+            "daily": [["YYYY-MM-DD", min, max, close]]}]
+    """
+    offers = {
+        row["pk"]: {
+            "offer_id": row["pk"],
+            "supplier": row["supplier__name"],
+            "points": [],
+            "daily": [],
+        }
+        for row in SupplierProduct.objects.filter(product_id=product_id)
+        .order_by(*BEST_OFFER_ORDER)
+        .values("pk", "supplier__name")
+    }
+
+    if not offers:
+        return []
+
+    first_month, _ = month_start(start)
+
+    # 🔹 구간 시작 시점의 값 (이전 달 마지막 기록, 압축됐으면 마지막 일별 종가)
+    # 시작 월 안의 압축된 날(시작일 전)이 있으면 그 종가가 더 최근 값
+    carry = {
+        pk: (price, stock)
+        for pk, (_moment, price, stock) in _latest_points(
+            list(offers), first_month
+        ).items()
+    }
+    for offer_id, price, stock in (
+        PriceHistoryDaily.objects.filter(
+            offer_id__in=list(offers),
+            day__gte=first_month,
+            day__lt=timezone.localtime(start).date(),
+        )
+        .order_by("offer_id", "-day")
+        .distinct("offer_id")
+        .values_list("offer_id", "close_price", "close_stock")
+    ):
+        carry[offer_id] = (price, stock)
+
+    for pk, (price, stock) in carry.items():
+        offers[pk]["points"].append([int(start.timestamp() * 1000), price, stock])
+
+    # 🔹 원본 기록 (월 단위 행)
+    for row in (
+        PriceHistory.objects.filter(
+            offer_id__in=list(offers),
+            month__gte=first_month,
+            month__lte=timezone.localtime(end).date(),
+        )
+        .order_by("offer_id", "month")
+        .values("offer_id", "month", "times", "prices", "stocks")
+    ):
+        points = offers[row["offer_id"]]["points"]
+
+        for moment, price, stock in _points(row):
+            if moment < start:
+                # 구간 이전 값은 시작 시점 값으로만 사용
+                points[:] = [[int(start.timestamp() * 1000), price, stock]]
+            elif moment <= end:
+                points.append([int(moment.timestamp() * 1000), price, stock])
+
+    # 🔹 일 단위로 압축된 기록
+    for row in (
+        PriceHistoryDaily.objects.filter(
+            offer_id__in=list(offers),
+            day__gte=timezone.localtime(start).date(),
+            day__lte=timezone.localtime(end).date(),
+        )
+        .order_by("offer_id", "day")
+        .values_list("offer_id", "day", "min_price", "max_price", "close_price")
+    ):
+        offer_id, day, low, high, close = row
+        offers[offer_id]["daily"].append([day.isoformat(), low, high, close])
+
+    return list(offers.values())
+
+
+def downsample_price_history(before, batch_size=500):
+    """
+    before(월 1일) 이전 월의 원본 기록을 일별 min/max/close로 압축 후 삭제
+    반환: (압축한 월 행 수, 생성/갱신한 일별 행 수)
+    """
+    rows = (
+        PriceHistory.objects.filter(month__lt=before)
+        .order_by("pk")
+        .values("pk", "offer_id", "month", "times", "prices", "stocks")
+    )
+
+    months = 0
+    days = 0
+
+    # 처리한 행은 삭제되므로 매번 앞에서부터 batch_size 만큼
+    while batch := list(rows[:batch_size]):
+        days += _downsample_batch(batch)
+        months += len(batch)
+
+    return months, days
+
+
+@transaction.atomic
+def _downsample_batch(rows):
+    daily = defaultdict(list)
+
+    for row in rows:
+        for moment, price, stock in _points(row):
+            daily[(row["offer_id"], timezone.localtime(moment).date())].append(
+                (price, stock)
+            )
+
+    values = [
+        (
+            offer_id,
+            day,
+            min(price for price, _stock in points),
+            max(price for price, _stock in points),
+            points[-1][0],
+            points[-1][1],
+        )
+        for (offer_id, day), points in sorted(daily.items())
+    ]
+
+    # offer_id 순서로 → 동시에 실행돼도 같은 순서로 행 잠금
+    if values:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _MERGE_DAILY_SQL.format(table=PriceHistoryDaily._meta.db_table),
+                [list(column) for column in zip(*values)],
+            )
+
+    PriceHistory.objects.filter(pk__in=[row["pk"] for row in rows]).delete()
+
+    return len(daily)
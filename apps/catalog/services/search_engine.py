@@ -0,0 +1,109 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Q, Subquery
+
+from apps.catalog.models import CanonicalProduct, Product, SupplierProduct
+from apps.catalog.services.part_number import (
+    MIN_PARTIAL_KEY_LENGTH,
+    is_part_number_query,
+    normalize_part_number,
+)
+
+# 한글/영문/부품번호가 섞여 있으므로 언어별 stemming 없이 simple 사전 사용
+SEARCH_CONFIG = "simple"
+
+# tsquery 연산자로 해석되는 문자 제거
+TSQUERY_SPECIAL_CHARS = re.compile(r"[&|!():*<>'\"\\]")
+
+
+def build_search_vector():
+    return (
+        SearchVector("name", "mpn", "serial_number", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("manufacturer", "brand", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("category__name", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def build_search_query(q):
+    tokens = TSQUERY_SPECIAL_CHARS.sub(" ", q or "").split()
+
+    if not tokens:
+        return None
+
+    # 입력 중인 단어도 매칭되도록 prefix 검색 (arduin → arduino)
+    raw = " & ".join(f"{token}:*" for token in tokens)
+
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def refresh_search_vectors(product_ids):
+    """
+    search_vector 재계산 (category.name 조인 포함, UPDATE 1회)
+    product_ids: id 리스트 또는 values("pk") 서브쿼리
+    """
+    vector = Subquery(
+        Product.objects.filter(pk=OuterRef("pk"))
+        .annotate(vector=build_search_vector())
+        .values("vector")[:1]
+    )
+
+    return Product.objects.filter(pk__in=product_ids).update(search_vector=vector)
+
+
+def part_number_filter(key, lookup="exact"):
+    # mpn_key / part_key 인덱스를 각각 타도록 조인 대신 서브쿼리 사용
+    condition = {f"mpn_key__{lookup}": key}
+
+    return (
+        Q(**condition)
+        | Q(
+            pk__in=SupplierProduct.objects.filter(
+                **{f"part_key__{lookup}": key}
+            ).values("product_id")
+        )
+        | Q(canonical_id__in=CanonicalProduct.objects.filter(**condition).values("pk"))
+    )
+
+
+def lookup_part_number(queryset, q):
+    """
+    부품번호 검색: 정확히 일치 → prefix → 부분일치(trigram) 순
+    부품번호 형태가 아니거나 결과가 없으면 None
+    """
+    if not is_part_number_query(q):
+        return None
+
+    key = normalize_part_number(q)
+
+    lookups = ["exact"]
+
+    if len(key) >= MIN_PARTIAL_KEY_LENGTH:
+        lookups += ["startswith", "contains"]
+
+    for lookup in lookups:
+        matched = queryset.filter(part_number_filter(key, lookup))
+
+        if matched.exists():
+            return matched.order_by("-created_at")
+
+    return None
+
+
+def search_products(queryset, q):
+    # 🔥 부품번호 입력은 인덱스 seek 경로 우선
+    matched = lookup_part_number(queryset, q)
+
+    if matched is not None:
+        return matched
+
+    query = build_search_query(q)
+
+    if query is None:
+        return queryset.none()
+
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "-created_at")
+    )
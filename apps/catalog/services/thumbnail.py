@@ -0,0 +1,22 @@
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.catalog.models import Product, ProductImage
+
+
+def refresh_thumbnails(product_ids):
+    """
+    Product.thumbnail 재계산 (is_thumbnail 우선, 없으면 첫 이미지)
+    목록 카드 내용이 바뀌므로 updated_at도 함께 갱신
+    """
+    first_image = (
+        ProductImage.objects.filter(product_id=OuterRef("pk"))
+        .order_by("-is_thumbnail", "id")
+        .values("image")[:1]
+    )
+
+    return Product.objects.filter(pk__in=product_ids).update(
+        thumbnail=Coalesce(Subquery(first_image), Value("")),
+        updated_at=timezone.now(),
+    )
@@ -0,0 +1,325 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.catalog.models import (
+    Category,
+    ExchangeRate,
+    OfferTombstone,
+    Product,
+    ProductImage,
+    Supplier,
+    SupplierProduct,
+)
+from apps.catalog.services.category_tree import invalidate_category_tree
+from apps.catalog.services.currency import invalidate_rates, to_krw
+from apps.catalog.services.facet_engine import (
+    FACET_FIELDS,
+    defer_facet_refresh,
+    refresh_facet_counts,
+)
+from apps.catalog.services.offer_summary import (
+    refresh_canonical_offers,
+    refresh_offer_summaries,
+)
+from apps.catalog.services.page_cache import bump_category_versions
+from apps.catalog.services.price_engine import invalidate_price_comparison
+from apps.catalog.services.price_history import record_price_changes
+from apps.catalog.services.search_engine import refresh_search_vectors
+from apps.catalog.services.thumbnail import refresh_thumbnails
+
+
+@receiver(pre_save, sender=Product)
+def product_saving(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # 저장 전 카테고리 / 대표상품 (바뀌었으면 이전 쪽 집계/캐시도 갱신)
+    previous = None
+
+    if instance.pk:
+        previous = (
+            Product.objects.filter(pk=instance.pk)
+            .values_list("category_id", "canonical_id")
+            .first()
+        )
+
+    previous = previous or (None, None)
+
+    instance._previous_category_id = previous[0]
+    instance._previous_canonical_id = previous[1]
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    # importer의 update_or_create / admin 저장 모두 여기로 들어옴
+    refresh_search_vectors([instance.pk])
+
+    # 대표상품 연결이 바뀌었을 수 있으므로 대표상품 최저가도 갱신
+    # (다른 대표상품으로 옮기거나 연결을 끊으면 이전 대표상품에서 오퍼가 빠짐)
+    canonical_ids = {
+        instance.canonical_id,
+        getattr(instance, "_previous_canonical_id", None),
+    } - {None}
+
+    if canonical_ids:
+        refresh_canonical_offers(canonical_ids)
+        _invalidate_prices_on_commit([], canonical_ids)
+
+    category_ids = {
+        instance.category_id,
+        getattr(instance, "_previous_category_id", None),
+    }
+
+    _bump_pages_on_commit(category_ids)
+
+    # 집계 필드가 바뀌지 않는 저장(대표상품 연결 등)은 facet 재계산 생략
+    if update_fields is None or FACET_FIELDS & set(update_fields):
+        _refresh_facets_on_commit(category_ids)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    # 증분 export 용 상품 단위 삭제 기록 (오퍼 행은 supplier_product_removed)
+    OfferTombstone.objects.create(product_id=instance.pk)
+
+    _bump_pages_on_commit([instance.category_id])
+    _refresh_facets_on_commit([instance.category_id])
+
+
+# 상품 카드 / 검색 벡터에 반영되는 Category 필드 (sort_order 등만 바뀌면 상품 갱신 생략)
+CATEGORY_PRODUCT_FIELDS = {"name", "slug", "parent"}
+
+
+def _category_product_values(category):
+    return (category.name, category.slug, category.parent_id)
+
+
+@receiver(pre_save, sender=Category)
+def category_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    # 저장 전 이름/slug/부모 (바뀌었을 때만 소속 상품 갱신)
+    instance._previous_product_values = None
+
+    if not instance.pk:
+        return
+
+    if update_fields is not None and not CATEGORY_PRODUCT_FIELDS & set(update_fields):
+        return
+
+    instance._previous_product_values = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list("name", "slug", "parent_id")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    # 커밋 이후에 버전을 바꿔야 다른 워커가 이전 데이터로 재생성하지 않음
+    transaction.on_commit(invalidate_category_tree)
+
+    if created:
+        return
+
+    previous = getattr(instance, "_previous_product_values", None)
+
+    if previous is None or previous == _category_product_values(instance):
+        return
+
+    products = Product.objects.filter(category_id=instance.pk)
+
+    # 카테고리명이 검색 대상이므로 소속 상품 벡터 갱신
+    refresh_search_vectors(products.values("pk"))
+
+    # 상품 카드에 카테고리명이 들어가므로 카드 캐시 키(updated_at) 갱신
+    products.update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def product_image_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    refresh_thumbnails([instance.product_id])
+
+    _bump_pages_on_commit(
+        Product.objects.filter(pk=instance.product_id).values_list(
+            "category_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=SupplierProduct)
+@receiver(post_delete, sender=SupplierProduct)
+def supplier_product_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # 다른 상품으로 옮겨졌으면 이전 상품도 (오퍼가 빠져나감)
+    product_ids = {
+        instance.product_id,
+        getattr(instance, "_previous_product_id", None),
+    } - {None}
+
+    # 최저가/공급처 수/총재고 요약 갱신 (bulk 경로는 refresh_offer_summaries 직접 호출)
+    refresh_offer_summaries(product_ids)
+
+    linked = Product.objects.filter(pk__in=product_ids).values_list(
+        "category_id", "canonical_id"
+    )
+    category_ids = [category_id for category_id, _ in linked]
+    canonical_ids = [canonical_id for _, canonical_id in linked if canonical_id]
+
+    if canonical_ids:
+        refresh_canonical_offers(canonical_ids)
+
+    _invalidate_prices_on_commit(product_ids, canonical_ids)
+
+    _bump_pages_on_commit(category_ids)
+
+    # 공급처 facet
+    _refresh_facets_on_commit(category_ids)
+
+
+@receiver(pre_save, sender=SupplierProduct)
+def supplier_product_saving(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    instance._previous_product_id = (
+        SupplierProduct.objects.filter(pk=instance.pk)
+        .values_list("product_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(pre_save, sender=SupplierProduct)
+def supplier_product_converting(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # 원화 환산가 (전체 재계산은 convert_prices 명령)
+    instance.currency = (instance.currency or "KRW").upper()
+    instance.price_krw = to_krw(instance.price, instance.currency)
+
+
+@receiver(post_save, sender=SupplierProduct)
+def supplier_product_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # 가격/재고가 바뀐 경우에만 이력 추가 (bulk 경로는 record_price_changes 직접 호출)
+    record_price_changes([instance])
+
+
+@receiver(post_save, sender=SupplierProduct)
+@receiver(post_delete, sender=SupplierProduct)
+def supplier_product_removed(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+
+    # 증분 export 용 삭제 기록: 삭제됐거나 다른 상품으로 옮겨진 이전 행
+    if kwargs["signal"] is post_delete:
+        product_id = instance.product_id
+    else:
+        product_id = getattr(instance, "_previous_product_id", None)
+
+        if created or product_id in (None, instance.product_id):
+            return
+
+    OfferTombstone.objects.create(
+        product_id=product_id,
+        supplier=Supplier.objects.filter(pk=instance.supplier_id)
+        .values_list("code", flat=True)
+        .first()
+        or "",
+        supplier_part_number=instance.supplier_part_number,
+    )
+
+
+@receiver(post_save, sender=ExchangeRate)
+@receiver(post_delete, sender=ExchangeRate)
+def exchange_rate_changed(sender, **kwargs):
+    # 오퍼 환산가는 convert_prices 명령에서 일괄 갱신
+    transaction.on_commit(invalidate_rates)
+
+
+@receiver(post_save, sender=Supplier)
+def supplier_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+
+    # 가격비교 캐시에 공급처명이 들어가므로 해당 공급처 상품 캐시 삭제
+    linked = SupplierProduct.objects.filter(supplier=instance).values_list(
+        "product_id", "product__canonical_id"
+    )
+
+    _invalidate_prices_on_commit(
+        [product_id for product_id, _ in linked],
+        [canonical_id for _, canonical_id in linked],
+    )
+
+
+def _invalidate_prices_on_commit(product_ids, canonical_ids=()):
+    product_ids = list(product_ids)
+    canonical_ids = list(canonical_ids)
+    transaction.on_commit(
+        lambda: invalidate_price_comparison(product_ids, canonical_ids)
+    )
+
+
+def _bump_pages_on_commit(category_ids):
+    # 페이지 캐시: 해당 카테고리 subtree 버전 갱신 (커밋 이후)
+    category_ids = [pk for pk in category_ids if pk]
+    transaction.on_commit(lambda: bump_category_versions(category_ids))
+
+
+# 트랜잭션 동안 facet 재계산을 요청한 카테고리 (DB 연결이 스레드별이므로 스레드 단위)
+_pending_facets = threading.local()
+
+
+def _run_pending_facet_refresh():
+    category_ids = getattr(_pending_facets, "category_ids", None)
+    _pending_facets.category_ids = None
+
+    if category_ids:
+        refresh_facet_counts(category_ids)
+
+
+def _refresh_facets_on_commit(category_ids):
+    # facet 집계: 해당 카테고리와 상위 카테고리만 재계산 (커밋 이후)
+    category_ids = {pk for pk in category_ids if pk}
+
+    if not category_ids or defer_facet_refresh(category_ids):
+        return
+
+    # 트랜잭션당 재계산 1회 (cascade 삭제 / admin 일괄 처리 등 행마다 재계산하지 않음)
+    # 커밋 시 처음 실행되는 콜백이 모인 카테고리를 모두 가져가고 나머지는 빈 집합
+    # 롤백되면 콜백만 사라지고 모인 카테고리는 다음 커밋 때 함께 재계산 (결과는 동일)
+    pending = getattr(_pending_facets, "category_ids", None)
+
+    if pending is None:
+        _pending_facets.category_ids = pending = set()
+
+    pending |= category_ids
+    transaction.on_commit(_run_pending_facet_refresh)
@@ -8,5 +8,27 @@ def query_transform(context, **kwargs):
     request = context["request"]
     updated = request.GET.copy()
     for k, v in kwargs.items():
-        updated[k] = v
+        # None 이면 파라미터 제거 (cursor ↔ page 전환 시)
+        if v is None:
+            updated.pop(k, None)
+        else:
+            updated[k] = v
+    return updated.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def facet_toggle(context, facet, value):
+    # facet 값 선택/해제 (같은 facet 다중 선택 가능), 페이지 위치는 초기화
+    request = context["request"]
+    updated = request.GET.copy()
+
+    values = updated.getlist(facet)
+    if value in values:
+        values.remove(value)
+    else:
+        values.append(value)
+    updated.setlist(facet, values)
+
+    updated.pop("page", None)
+    updated.pop("cursor", None)
     return updated.urlencode()
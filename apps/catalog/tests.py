@@ -1,3 +1,541 @@
-from django.test import TestCase
+import base64
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from apps.catalog.pagination import NEXT, PREVIOUS, decode_cursor, encode_cursor
+from apps.catalog.services.base_importer import NormalizedItem
+from apps.catalog.services.bulk_compare import MAX_BULK_PARTS, parse_parts
+from apps.catalog.services.category_paths import (
+    MAX_CATEGORY_DEPTH,
+    NAME_MAX_LENGTH,
+    is_truncated,
+    normalize_path,
+)
+from apps.catalog.services.currency import convert_prices, to_krw
+from apps.catalog.services.external_api import (
+    digikey_auth,
+    http_client,
+    response_cache,
+)
+from apps.catalog.services.external_api.http_client import (
+    SupplierApiError,
+    SupplierClient,
+    TokenBucket,
+    retry_after_seconds,
+)
+from apps.catalog.services.importers.upsert_engine import content_hash
+from apps.catalog.services.part_number import (
+    is_part_number_query,
+    normalize_manufacturer,
+    normalize_part_number,
+)
+
+
+class StubSupplier:
+    """
+    로컬 stub 공급처 서버
+    responses: [(status, headers)] 를 순서대로 응답, 마지막 응답은 이후 계속 반복
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.hits = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers = stub.responses[
+                    min(stub.hits, len(stub.responses) - 1)
+                ]
+                stub.hits += 1
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class SupplierClientTests(SimpleTestCase):
+    def client_for(self, stub, **options):
+        options.setdefault("rate_per_minute", 60000)
+        options.setdefault("burst", 100)
+        options.setdefault("timeout", (1, 2))
+        return SupplierClient("stub", stub.url, **options)
+
+    def test_429_waits_for_retry_after(self):
+        with StubSupplier([(429, {"Retry-After": "3"}), (200, {})]) as stub:
+            with mock.patch.object(http_client.time, "sleep") as sleep:
+                response = self.client_for(stub).get("/search")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(stub.hits, 2)
+        sleep.assert_called_once_with(3.0)
+
+    def test_long_retry_after_is_not_shortened(self):
+        with StubSupplier([(429, {"Retry-After": "120"}), (200, {})]) as stub:
+            with mock.patch.object(http_client.time, "sleep") as sleep:
+                response = self.client_for(stub, backoff_max=30.0).get("/search")
+
+        self.assertEqual(response.status_code, 200)
+        sleep.assert_called_once_with(120.0)
+
+    def test_retry_after_over_limit_raises(self):
+        with StubSupplier([(429, {"Retry-After": "3600"}), (200, {})]) as stub:
+            with mock.patch.object(http_client.time, "sleep") as sleep:
+                client = self.client_for(stub, retry_after_max=600.0)
+
+                with self.assertRaises(SupplierApiError) as ctx:
+                    client.get("/search")
+
+        self.assertEqual(ctx.exception.status, 429)
+        self.assertIn("Retry-After", str(ctx.exception))
+        self.assertEqual(stub.hits, 1)
+        sleep.assert_not_called()
+
+    def test_5xx_backs_off_then_raises(self):
+        with StubSupplier([(503, {})]) as stub:
+            with mock.patch.object(http_client.time, "sleep") as sleep:
+                client = self.client_for(stub, max_retries=3, backoff_base=0.5)
+
+                with self.assertRaises(SupplierApiError) as ctx:
+                    client.get("/search")
+
+        self.assertEqual(ctx.exception.status, 503)
+        self.assertEqual(stub.hits, 4)
+
+        # full jitter: attempt n 의 대기는 0 ~ base * 2**n
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 3)
+        for attempt, wait in enumerate(waits):
+            self.assertGreaterEqual(wait, 0)
+            self.assertLessEqual(wait, 0.5 * 2**attempt)
+
+    def test_client_errors_are_not_retried(self):
+        with StubSupplier([(404, {})]) as stub:
+            with self.assertRaises(SupplierApiError) as ctx:
+                self.client_for(stub).get("/missing")
+
+        self.assertEqual(ctx.exception.status, 404)
+        self.assertEqual(stub.hits, 1)
+
+    def test_connection_errors_are_retried(self):
+        with StubSupplier([(200, {})]) as stub:
+            url = stub.url
+
+        # 서버 종료 후 같은 포트 → 연결 거부
+        client = SupplierClient("stub", url, rate_per_minute=60000, max_retries=2)
+
+        with mock.patch.object(http_client.time, "sleep") as sleep:
+            with self.assertRaises(SupplierApiError) as ctx:
+                client.get("/search")
+
+        self.assertIsNone(ctx.exception.status)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_retry_after_http_date(self):
+        response = mock.Mock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(retry_after_seconds(response), 0.0)
+
+        response = mock.Mock(headers={})
+        self.assertIsNone(retry_after_seconds(response))
+
+    def test_limiter_paces_requests(self):
+        with StubSupplier([(200, {})]) as stub:
+            client = self.client_for(stub, rate_per_minute=120, burst=2)
+
+            clock = [0.0]
+            waits = []
+
+            def sleep(seconds):
+                waits.append(seconds)
+                clock[0] += seconds
+
+            client.limiter = TokenBucket(
+                120, burst=2, clock=lambda: clock[0], sleep=sleep
+            )
+
+            for _ in range(5):
+                client.get("/search")
+
+        # burst 2건은 즉시, 이후 분당 120회 = 0.5초 간격
+        self.assertEqual(stub.hits, 5)
+        self.assertEqual(len(waits), 3)
+        self.assertAlmostEqual(clock[0], 1.5)
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_refills_at_rate(self):
+        clock = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            clock[0] += seconds
+
+        bucket = TokenBucket(60, burst=1, clock=lambda: clock[0], sleep=sleep)
+
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(waits, [1.0])
+
+        # 쉬는 동안 burst 만큼만 쌓임
+        clock[0] += 10
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(waits, [1.0, 1.0])
+
+
+class DigiKeyTokenTests(SimpleTestCase):
+    def setUp(self):
+        cache.delete_many([digikey_auth.TOKEN_CACHE_KEY, digikey_auth.TOKEN_LOCK_KEY])
+
+        state = mock.patch.multiple(digikey_auth, _token=None, _expires_at=0.0)
+        state.start()
+        self.addCleanup(state.stop)
+        self.addCleanup(
+            cache.delete_many,
+            [digikey_auth.TOKEN_CACHE_KEY, digikey_auth.TOKEN_LOCK_KEY],
+        )
+
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+        def fetch():
+            with self.calls_lock:
+                self.calls += 1
+                n = self.calls
+
+            # 발급 중에 다른 호출이 몰리도록 잠깐 대기
+            threading.Event().wait(0.2)
+            return f"token-{n}", 600
+
+        fetch_patch = mock.patch.object(digikey_auth, "fetch_access_token", fetch)
+        fetch_patch.start()
+        self.addCleanup(fetch_patch.stop)
+
+    def test_concurrent_callers_share_one_refresh(self):
+        tokens = []
+        barrier = threading.Barrier(10)
+
+        def call():
+            barrier.wait()
+            tokens.append(digikey_auth.get_access_token())
+
+        threads = [threading.Thread(target=call) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(set(tokens), {"token-1"})
+
+    def test_shared_cache_is_used_across_workers(self):
+        digikey_auth.get_access_token()
+
+        # 다른 워커 = 프로세스 메모리는 비어 있고 공유 캐시만 있음
+        with mock.patch.multiple(digikey_auth, _token=None, _expires_at=0.0):
+            self.assertEqual(digikey_auth.get_access_token(), "token-1")
+
+        self.assertEqual(self.calls, 1)
+
+    def test_invalidate_forces_refresh(self):
+        self.assertEqual(digikey_auth.get_access_token(), "token-1")
+
+        digikey_auth.invalidate_access_token()
+
+        self.assertEqual(digikey_auth.get_access_token(), "token-2")
+        self.assertEqual(self.calls, 2)
+
+
+class PartNumberTests(SimpleTestCase):
+    def test_separators_case_and_digikey_suffix_are_ignored(self):
+        for value in (
+            "STM32F103-C8T6",
+            "stm32f103c8t6",
+            " STM32F103 C8T6 ",
+            "STM32F103C8T6-ND",
+        ):
+            self.assertEqual(normalize_part_number(value), "STM32F103C8T6")
+
+    def test_empty_input(self):
+        self.assertEqual(normalize_part_number(""), "")
+        self.assertEqual(normalize_part_number(None), "")
+        self.assertEqual(normalize_part_number(" -/ "), "")
+
+    def test_part_number_query(self):
+        self.assertTrue(is_part_number_query("STM32"))
+        self.assertTrue(is_part_number_query(" 1N4148 "))
+        self.assertFalse(is_part_number_query("arduino board"))
+        self.assertFalse(is_part_number_query("LED"))
+        self.assertFalse(is_part_number_query(""))
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        created_at = timezone.make_aware(datetime(2026, 10, 18, 12, 30, 15, 123456))
+        token = encode_cursor(NEXT, SimpleNamespace(created_at=created_at, pk=42))
+
+        self.assertNotIn("=", token)
+        self.assertEqual(decode_cursor(token), (NEXT, created_at, 42))
+
+    def test_previous_direction(self):
+        created_at = timezone.make_aware(datetime(2026, 1, 1))
+        token = encode_cursor(PREVIOUS, SimpleNamespace(created_at=created_at, pk=7))
+
+        self.assertEqual(decode_cursor(token), (PREVIOUS, created_at, 7))
+
+    def test_bad_cursors_are_ignored(self):
+        def encoded(raw):
+            return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+        for token in (
+            "",
+            "!!not-base64!!",
+            encoded(b"x|2026-10-18T12:30:00|1"),  # 방향
+            encoded(b"n|yesterday|1"),  # 시각
+            encoded(b"n|2026-10-18T12:30:00|abc"),  # pk
+            encoded(b"n|2026-10-18T12:30:00"),  # 구간 수
+            encoded(b"\xff\xfe|\xff|1"),  # UTF-8 아님
+        ):
+            self.assertIsNone(decode_cursor(token), token)
+
+
+class BulkCompareTests(SimpleTestCase):
+    def test_parse_parts(self):
+        specs = parse_parts(
+            [
+                "stm32f103c8t6-slug",
+                {"mpn": "STM32F103-C8T6", "manufacturer": " STMicroelectronics "},
+                {"slug": "esp32-devkit"},
+            ]
+        )
+
+        self.assertEqual(specs[0]["slug"], "stm32f103c8t6-slug")
+        self.assertEqual(specs[0]["key"], "STM32F103C8T6SLUG")
+        self.assertEqual(specs[1]["slug"], "")
+        self.assertEqual(specs[1]["key"], "STM32F103C8T6")
+        self.assertEqual(specs[1]["manufacturer"], "STMicroelectronics")
+        self.assertEqual(specs[2]["key"], "")
+        self.assertEqual(specs[2]["query"], {"slug": "esp32-devkit"})
+
+    def test_parse_parts_rejects_bad_input(self):
+        for parts in (
+            [],
+            None,
+            "STM32",
+            [{}],
+            [{"manufacturer": "TI"}],
+            [42],
+            ["x"] * (MAX_BULK_PARTS + 1),
+        ):
+            with self.assertRaises(ValueError):
+                parse_parts(parts)
+
+    def test_manufacturer_key(self):
+        for value in (
+            "Texas Instruments",
+            "Texas Instruments Inc.",
+            "TEXAS INSTRUMENTS, INCORPORATED",
+            "texas-instruments",
+        ):
+            self.assertEqual(normalize_manufacturer(value), "texasinstruments")
+
+        self.assertEqual(
+            normalize_manufacturer("Samsung Electro-Mechanics Co., Ltd."),
+            "samsungelectromechanics",
+        )
+        self.assertEqual(normalize_manufacturer("삼성전기 주식회사"), "삼성전기")
+        # 접미사만 있는 이름은 그대로
+        self.assertEqual(normalize_manufacturer("Co"), "co")
+        self.assertEqual(normalize_manufacturer(""), "")
+        self.assertEqual(normalize_manufacturer(None), "")
+
+
+class CurrencyTests(SimpleTestCase):
+    rates = {"KRW": 1.0, "USD": 1400.0, "EUR": 1500.0}
+
+    def test_convert_prices(self):
+        krw = convert_prices(
+            [10, 2.5, 1000, 0.123], ["USD", "EUR", "KRW", "USD"], self.rates
+        )
+
+        self.assertEqual(krw.tolist(), [14000.0, 3750.0, 1000.0, 172.2])
+
+    def test_missing_rate_is_nan(self):
+        krw = convert_prices([10, 10], ["USD", "JPY"], self.rates)
+
+        self.assertEqual(krw[0], 14000.0)
+        self.assertTrue(np.isnan(krw[1]))
+
+    def test_empty_input(self):
+        self.assertEqual(convert_prices([], [], self.rates).tolist(), [])
+
+    def test_to_krw(self):
+        self.assertEqual(to_krw(10, "usd", self.rates), 14000.0)
+        self.assertEqual(to_krw(500, None, self.rates), 500.0)
+        self.assertIsNone(to_krw(10, "JPY", self.rates))
+        self.assertIsNone(to_krw(None, "USD", self.rates))
+
+
+class ContentHashTests(SimpleTestCase):
+    rates = {"KRW": 1.0, "USD": 1400.0}
+
+    def item(self, **changes):
+        values = {
+            "supplier_code": "digikey",
+            "supplier_part_number": "497-6063-ND",
+            "manufacturer": "STMicroelectronics",
+            "mpn": "STM32F103C8T6",
+            "name": "IC MCU 32BIT 64KB FLASH",
+            "price": 5.12,
+            "stock": 120,
+            "url": "https://example.com/497-6063-ND",
+            "category_path": ["Integrated Circuits", "Microcontrollers"],
+            "currency": "USD",
+        }
+        values.update(changes)
+        return NormalizedItem(**values)
+
+    def test_same_item_and_rate_give_same_hash(self):
+        digest = content_hash(self.item(), self.rates)
+
+        self.assertEqual(digest, content_hash(self.item(), dict(self.rates)))
+        self.assertRegex(digest, r"^[0-9a-f]{32}$")
+
+    def test_any_field_change_changes_hash(self):
+        digest = content_hash(self.item(), self.rates)
+
+        for changes in (
+            {"price": 5.13},
+            {"stock": 119},
+            {"name": "IC MCU"},
+            {"category_path": ["Integrated Circuits"]},
+            {"image_url": "https://example.com/a.jpg"},
+        ):
+            self.assertNotEqual(content_hash(self.item(**changes), self.rates), digest)
+
+    def test_rate_change_changes_hash(self):
+        digest = content_hash(self.item(), self.rates)
+
+        self.assertNotEqual(
+            content_hash(self.item(), {**self.rates, "USD": 1390.0}), digest
+        )
+        # 다른 통화 환율은 무관
+        self.assertEqual(content_hash(self.item(), {**self.rates, "EUR": 1.0}), digest)
+
+    def test_missing_rate(self):
+        digest = content_hash(self.item(), {"KRW": 1.0})
+
+        self.assertEqual(digest, content_hash(self.item(), {"KRW": 1.0}))
+        self.assertNotEqual(digest, content_hash(self.item(), self.rates))
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        settings_patch = override_settings(
+            SUPPLIER_RESPONSE_CACHE_DIR=directory.name,
+            SUPPLIER_RESPONSE_CACHE_RECORD=True,
+        )
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+        self.addCleanup(response_cache.set_replay, False)
+
+    def test_request_key(self):
+        key = response_cache.request_key("digikey", {"a": 1, "b": [1, 2]})
+
+        self.assertEqual(
+            key, response_cache.request_key("digikey", {"b": [1, 2], "a": 1})
+        )
+        self.assertNotEqual(
+            key, response_cache.request_key("icbanq", {"a": 1, "b": [1, 2]})
+        )
+        self.assertNotEqual(
+            key, response_cache.request_key("digikey", {"a": 2, "b": [1, 2]})
+        )
+        self.assertRegex(key, r"^[0-9a-f]{64}$")
+
+    def test_recorded_response_is_replayed(self):
+        data = {"Products": [{"DigiKeyPartNumber": "497-6063-ND"}]}
+
+        self.assertEqual(
+            response_cache.cached_json("digikey", {"q": 1}, lambda: data), data
+        )
+
+        response_cache.set_replay()
+        fetch = mock.Mock(side_effect=AssertionError("network call in replay"))
+
+        self.assertEqual(response_cache.cached_json("digikey", {"q": 1}, fetch), data)
+        fetch.assert_not_called()
+
+    def test_replay_miss_raises(self):
+        response_cache.set_replay()
+        fetch = mock.Mock()
+
+        with self.assertRaises(response_cache.ReplayMissError):
+            response_cache.cached_json("digikey", {"q": "never recorded"}, fetch)
+
+        fetch.assert_not_called()
+
+    def test_nothing_is_stored_unless_recording(self):
+        key = response_cache.request_key("digikey", {"q": 2})
+
+        with override_settings(SUPPLIER_RESPONSE_CACHE_RECORD=False):
+            response_cache.cached_json("digikey", {"q": 2}, lambda: {"ok": True})
+
+        self.assertIsNone(response_cache.load(key))
+
+
+class CategoryPathTests(SimpleTestCase):
+    def test_blank_levels_and_whitespace_are_dropped(self):
+        self.assertEqual(
+            normalize_path([" Sensors ", "", "  ", "Temperature"]),
+            ("Sensors", "Temperature"),
+        )
+
+    def test_empty_input(self):
+        self.assertEqual(normalize_path(None), ())
+        self.assertEqual(normalize_path([]), ())
+        self.assertEqual(normalize_path(["", " "]), ())
+        self.assertFalse(is_truncated(None))
+
+    def test_depth_is_capped(self):
+        path = [f"L{n}" for n in range(MAX_CATEGORY_DEPTH + 2)]
+
+        self.assertEqual(normalize_path(path), tuple(path[:MAX_CATEGORY_DEPTH]))
+        self.assertTrue(is_truncated(path))
+        self.assertFalse(is_truncated(path[:MAX_CATEGORY_DEPTH]))
+
+    def test_long_names_are_cut(self):
+        (name,) = normalize_path(["x" * (NAME_MAX_LENGTH + 10)])
+
+        self.assertEqual(len(name), NAME_MAX_LENGTH)
@@ -8,6 +8,19 @@ urlpatterns = [
     path("", views.home, name="home"),
     path("category/<str:category_slug>/", views.category, name="category"),
     path("<int:pk>/", views.product_detail, name="detail"),
+    path(
+        "<int:pk>/price-history/",
+        views.product_price_history,
+        name="price_history",
+    ),
     # 🔥 가격비교 API
+    path("compare/bulk/", views.bulk_price_compare, name="compare_bulk"),
+    path(
+        "compare/canonical/<int:pk>/",
+        views.canonical_price_compare,
+        name="compare_canonical",
+    ),
     path("compare/<slug:slug>/", product_price_compare, name="compare"),
+    # 🔥 제휴사 export (staff 또는 토큰)
+    path("export/offers/", views.export_offers, name="export_offers"),
 ]
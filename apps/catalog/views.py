@@ -1,43 +1,80 @@
-from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator
-from .models import Product, Category
-from django.db.models import Q
-from django.shortcuts import render
-from django.http import Http404
-from django.db.models import Q
-from django.core.paginator import Paginator
-
-from django.db.models import Q
-from django.core.paginator import Paginator
-from .models import Product, Category
-from apps.catalog.services.price_engine import get_price_comparison
-
-
+import hmac
+from datetime import datetime, time, timedelta
+
+import orjson
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from apps.catalog.models import LIST_PRICE, CanonicalProduct, Product
+from apps.catalog.services.price_engine import (
+    get_canonical_price_comparison,
+    get_price_comparison,
+)
+from apps.catalog.services.search_engine import search_products
+from apps.catalog.pagination import paginate_products
+from apps.catalog.services.category_tree import get_category_tree, get_tree_version
+from apps.catalog.services.facet_engine import apply_facet_filters, build_facets
+from apps.catalog.services.page_cache import anonymous_page_cache
+from apps.catalog.conditional import offer_validators, private_cache, public_cache
+from apps.catalog.services.bulk_compare import (
+    BULK_STREAM_THRESHOLD,
+    bulk_comparison_json,
+    parse_parts,
+    stream_bulk_comparison_json,
+)
+from apps.catalog.services.offer_export import (
+    EXPORT_FORMATS,
+    export_watermark,
+    iter_export,
+)
+from apps.catalog.services.price_history import get_price_history
+from apps.cart.context_processors import get_cart_count
+
+# ?sort= 정렬 (표시가 기준: 공급처 최저가, 오퍼가 없으면 판매가)
+PRICE_SORTS = {
+    "price": (LIST_PRICE.asc(nulls_last=True), "id"),
+    "price_desc": (LIST_PRICE.desc(nulls_last=True), "-id"),
+}
+
+
+def apply_sort(products, request):
+    sort = request.GET.get("sort", "")
+
+    if sort in PRICE_SORTS:
+        return products.order_by(*PRICE_SORTS[sort]), False
+
+    return products, True
+
+
+@anonymous_page_cache(lambda request: None)
 def home(request):
     q = request.GET.get("q", "").strip()
 
     products = Product.objects.filter(is_active=True).select_related("category")
 
-    # 🔥 검색 기능
+    # 🔥 facet 필터 (제조사/브랜드/공급처/가격대/몰/재고)
+    products = apply_facet_filters(products, request.GET)
+
+    # 🔥 검색 기능 (search_vector GIN 인덱스, 관련도순)
     if q:
-        products = products.filter(
-            Q(name__icontains=q)
-            | Q(category__name__icontains=q)
-            | Q(brand__icontains=q)
-            | Q(serial_number__icontains=q)
-            | Q(mpn__icontains=q)  # 🔥 추가 (MPN 검색)
-            | Q(manufacturer__icontains=q)  # 🔥 추가
-        )
+        products = search_products(products, q)
+    else:
+        products = products.order_by("-created_at", "-id")
 
-    products = products.order_by("-created_at")
+    # 🔥 최저가 정렬 (cursor 페이지는 기본 정렬에서만)
+    products, default_order = apply_sort(products, request)
 
-    paginator = Paginator(products, 12)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    page_obj = paginate_products(
+        request, products, allow_cursor=default_order and not q
+    )
 
     # 🔥 1차 카테고리
-    categories = Category.objects.filter(parent__isnull=True, is_active=True).order_by(
-        "sort_order"
-    )
+    categories = get_category_tree().roots
 
     return render(
         request,
@@ -45,13 +82,23 @@ def home(request):
         {
             "products": page_obj,
             "categories": categories,
+            "facets": build_facets(None, request.GET),
             "q": q,
         },
     )
 
 
+def category_scope(request, category_slug):
+    node = get_category_tree().get_by_slug(category_slug)
+    return node.id if node else None
+
+
+@anonymous_page_cache(category_scope)
 def category(request, category_slug):
-    category = Category.objects.filter(slug=category_slug).first()
+    # 🔹 카테고리 관련 조회는 모두 트리 스냅샷에서 (쿼리 없음)
+    tree = get_category_tree()
+
+    category = tree.get_by_slug(category_slug)
 
     if not category:
         raise Http404("Category not found")
@@ -59,35 +106,36 @@ def category(request, category_slug):
     q = request.GET.get("q", "").strip()
 
     # 🔹 현재 카테고리의 최상위 찾기
-    root = category
-    while root.parent:
-        root = root.parent
+    root = tree.get_root(category)
 
     # 🔹 1차 카테고리
-    categories = Category.objects.filter(parent__isnull=True, is_active=True).order_by(
-        "sort_order"
-    )
+    categories = tree.roots
 
     # 🔹 사이드바 (2차)
-    sidebar_categories = root.children.filter(is_active=True).order_by("sort_order")
+    sidebar_categories = root.children
 
     # 🔹 현재 카테고리 + 하위 포함
-    descendant_ids = category.get_descendant_ids()
+    descendant_ids = tree.descendant_ids(category)
 
     products = Product.objects.filter(
         category_id__in=descendant_ids, is_active=True
     ).select_related("category")
 
+    # 🔹 facet 필터
+    products = apply_facet_filters(products, request.GET)
+
     # 🔹 검색
     if q:
-        products = products.filter(
-            Q(name__icontains=q) | Q(brand__icontains=q) | Q(serial_number__icontains=q)
-        )
+        products = search_products(products, q)
+    else:
+        products = products.order_by("-created_at", "-id")
 
-    products = products.order_by("-created_at")
+    # 🔥 최저가 정렬 (cursor 페이지는 기본 정렬에서만)
+    products, default_order = apply_sort(products, request)
 
-    paginator = Paginator(products, 12)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    page_obj = paginate_products(
+        request, products, allow_cursor=default_order and not q
+    )
 
     return render(
         request,
@@ -97,17 +145,37 @@ def category(request, category_slug):
             "products": page_obj,
             "categories": categories,  # 1차
             "sidebar_categories": sidebar_categories,  # 2차
+            "facets": build_facets(category.id, request.GET),
             "q": q,
         },
     )
 
 
 def product_detail(request, pk):
-    product = Product.objects.prefetch_related("supplier_products__supplier").get(pk=pk)
+    product = get_object_or_404(Product, pk=pk)
+
+    # 🔥 조건부 GET ― 상품/오퍼가 그대로면 렌더링 없이 304
+    # (헤더의 로그인 사용자, 장바구니 수량, 카테고리 메뉴 버전 포함)
+    validators = offer_validators(
+        product,
+        request.user.pk,
+        get_cart_count(request),
+        get_tree_version(),
+        canonical_id=product.canonical_id,
+    )
 
-    prices = product.supplier_products.all().order_by("price")
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return private_cache(not_modified)
 
-    return render(
+    # 🔥 가격비교 (캐시, 최저가 순)
+    # 대표상품에 연결되어 있으면 다른 importer로 들어온 같은 부품의 오퍼까지 비교
+    if product.canonical_id:
+        prices = get_canonical_price_comparison(product.canonical_id)
+    else:
+        prices = get_price_comparison(product)
+
+    response = render(
         request,
         "catalog/product_detail.html",
         {
@@ -116,9 +184,7 @@ def product_detail(request, pk):
         },
     )
 
-
-from django.http import JsonResponse
-from apps.catalog.models import Product
+    return private_cache(validators.apply(response))
 
 
 def product_price_compare(request, slug):
@@ -127,19 +193,16 @@ def product_price_compare(request, slug):
     except Product.DoesNotExist:
         return JsonResponse({"error": "Product not found"}, status=404)
 
-    suppliers = []
+    # 🔥 변경 없으면 직렬화 없이 304 (오퍼 집계 + 삭제 시각 쿼리)
+    validators = offer_validators(product)
 
-    for sp in product.supplier_products.select_related("supplier"):
-        suppliers.append(
-            {
-                "supplier": sp.supplier.name,
-                "price": sp.price,
-                "stock": sp.stock,
-                "url": sp.url,
-            }
-        )
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return public_cache(not_modified)
 
-    return JsonResponse(
+    suppliers = get_price_comparison(product)
+
+    response = JsonResponse(
         {
             "product": product.name,
             "manufacturer": product.manufacturer,
@@ -147,3 +210,142 @@ def product_price_compare(request, slug):
             "suppliers": suppliers,
         }
     )
+
+    return public_cache(validators.apply(response))
+
+
+def canonical_price_compare(request, pk):
+    try:
+        canonical = CanonicalProduct.objects.get(pk=pk)
+    except CanonicalProduct.DoesNotExist:
+        return JsonResponse({"error": "Canonical product not found"}, status=404)
+
+    return JsonResponse(
+        {
+            "manufacturer": canonical.manufacturer,
+            "mpn": canonical.mpn,
+            "name": canonical.name,
+            "best_price": canonical.best_price,
+            "offer_count": canonical.offer_count,
+            "supplier_count": canonical.supplier_count,
+            "suppliers": get_canonical_price_comparison(canonical),
+        }
+    )
+
+
+def product_price_history(request, pk):
+    """
+    가격 이력 차트 데이터
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD (기본: 최근 30일)
+    """
+    product = get_object_or_404(Product.objects.only("pk"), pk=pk)
+
+    try:
+        # 형식은 맞지만 없는 날짜(2026-02-30)는 ValueError
+        end_date = parse_date(request.GET.get("to", "")) or timezone.localdate()
+        start_date = parse_date(request.GET.get("from", "")) or end_date - timedelta(
+            days=30
+        )
+    except ValueError as e:
+        return JsonResponse({"error": f"Invalid date: {e}"}, status=400)
+
+    if start_date > end_date:
+        return JsonResponse({"error": "from must be before to"}, status=400)
+
+    start = timezone.make_aware(datetime.combine(start_date, time.min))
+    end = timezone.make_aware(datetime.combine(end_date, time.max))
+
+    return HttpResponse(
+        orjson.dumps(
+            {
+                "from": start_date,
+                "to": end_date,
+                "currency": "KRW",
+                "offers": get_price_history(product.pk, start, end),
+            }
+        ),
+        content_type="application/json",
+    )
+
+
+@csrf_exempt
+@require_POST
+def bulk_price_compare(request):
+    """
+    BOM 일괄 가격비교
+    POST {"parts": ["slug", "MPN", {"manufacturer": "TI", "mpn": "..."}]}
+    """
+    try:
+        body = orjson.loads(request.body)
+    except orjson.JSONDecodeError as e:
+        return JsonResponse({"error": f"Invalid JSON: {e}"}, status=400)
+
+    if not isinstance(body, dict):
+        return JsonResponse({"error": 'Body must be {"parts": [...]}'}, status=400)
+
+    try:
+        specs = parse_parts(body.get("parts"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    if len(specs) > BULK_STREAM_THRESHOLD:
+        return StreamingHttpResponse(
+            stream_bulk_comparison_json(specs), content_type="application/json"
+        )
+
+    return HttpResponse(bulk_comparison_json(specs), content_type="application/json")
+
+
+def _export_allowed(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+
+    # 제휴사용: Authorization: Bearer <CATALOG_EXPORT_TOKEN>
+    token = settings.CATALOG_EXPORT_TOKEN
+    header = request.headers.get("Authorization", "")
+
+    return bool(token) and hmac.compare_digest(header, f"Bearer {token}")
+
+
+def export_offers(request):
+    """
+    전체 상품/오퍼 스트리밍 export
+    ?format=ndjson|csv&since=<ISO datetime>
+    X-Export-Watermark: 다음 since 값 (이전 export 와 겹치는 행이 있으므로 받는 쪽에서 중복 제거)
+    deleted=true 행은 받는 쪽에서 삭제 (since 가 있으면 삭제된 오퍼/상품 행이 먼저 나옴,
+    supplier 가 비어 있는 삭제 행은 상품 전체)
+    """
+    if not _export_allowed(request):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+
+    fmt = request.GET.get("format", "ndjson")
+
+    if fmt not in EXPORT_FORMATS:
+        return JsonResponse({"error": f"Unknown format: {fmt}"}, status=400)
+
+    since = None
+
+    if request.GET.get("since"):
+        try:
+            since = parse_datetime(request.GET["since"])
+        except ValueError:
+            # 형식은 맞지만 없는 시각 (2026-13-01T00:00)
+            since = None
+
+        if since is None:
+            return JsonResponse({"error": "Invalid since"}, status=400)
+
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+
+    # 다음 증분 export의 since 값 (늦게 커밋된 행이 빠지지 않도록 여유를 두고 앞당김)
+    watermark = export_watermark()
+
+    response = StreamingHttpResponse(
+        iter_export(fmt, since),
+        content_type="text/csv" if fmt == "csv" else "application/x-ndjson",
+    )
+    response["X-Export-Watermark"] = watermark.isoformat()
+    response["Content-Disposition"] = f'attachment; filename="offers.{fmt}"'
+
+    return response
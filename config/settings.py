@@ -74,6 +74,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "apps.cart",
     "apps.orders.apps.OrdersConfig",
     "apps.catalog",
@@ -136,6 +137,27 @@ DATABASES = {
     }
 }
 
+# ========================
+# CACHE
+# ========================
+
+# 워커 간 캐시 무효화(카테고리 트리 버전 등)를 위해 운영에서는 Redis 사용
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # ========================
 # DIGIKEY API
 # ========================
@@ -143,8 +165,87 @@ DATABASES = {
 DIGIKEY_CLIENT_ID = os.getenv("DIGIKEY_CLIENT_ID")
 DIGIKEY_CLIENT_SECRET = os.getenv("DIGIKEY_CLIENT_SECRET")
 DIGIKEY_ENV = os.getenv("DIGIKEY_ENV", "production")
+# Digi-Key 가격 통화 (X-DIGIKEY-Locale-Currency), 원화 환산은 ExchangeRate 기준
+DIGIKEY_CURRENCY = os.getenv("DIGIKEY_CURRENCY", "USD")
+
+# 키워드 검색 페이지 크기 (v4 keyword search Limit 최대 50) / 키워드당 최대 결과 수
+# 키워드당 API 호출 = ceil(결과 수 / 페이지 크기) → 기본 100건 = 2회 (호출 한도는 아래)
+DIGIKEY_PAGE_SIZE = int(os.getenv("DIGIKEY_PAGE_SIZE", "50"))
+DIGIKEY_RESULTS_PER_KEYWORD = int(os.getenv("DIGIKEY_RESULTS_PER_KEYWORD", "100"))
+
+# API 주소 (로컬 stub 서버로 테스트할 때 DIGIKEY_BASE_URL 지정)
+DIGIKEY_BASE_URL = os.getenv("DIGIKEY_BASE_URL") or (
+    "https://sandbox-api.digikey.com"
+    if DIGIKEY_ENV == "sandbox"
+    else "https://api.digikey.com"
+)
+
+# ========================
+# SUPPLIER HTTP CLIENT
+# ========================
+
+# (connect, read) 초
+SUPPLIER_HTTP_TIMEOUT = (5, 30)
+SUPPLIER_HTTP_MAX_RETRIES = int(os.getenv("SUPPLIER_HTTP_MAX_RETRIES", "4"))
+# 429/503 Retry-After 는 그대로 기다림, 이보다 길면 재시도하지 않고 실패 (초)
+SUPPLIER_HTTP_RETRY_AFTER_MAX = float(os.getenv("SUPPLIER_HTTP_RETRY_AFTER_MAX", "600"))
+
+# 공급처별 호출 한도 (Digi-Key Product Information API: 분당 120회)
+# import_digikey_categories (24 키워드) 1회 = 24 × ceil(RESULTS_PER_KEYWORD / PAGE_SIZE)
+# 검색 호출 → 기본값 48회, RESULTS_PER_KEYWORD=500 이면 240회 (약 2분, 일일 한도도 확인)
+SUPPLIER_APIS = {
+    "digikey": {
+        "base_url": DIGIKEY_BASE_URL,
+        "rate_per_minute": int(os.getenv("DIGIKEY_RATE_PER_MINUTE", "120")),
+        "burst": 10,
+    },
+    "icbanq": {
+        "base_url": os.getenv("ICBANQ_BASE_URL", "https://www.icbanq.com"),
+        "rate_per_minute": int(os.getenv("ICBANQ_RATE_PER_MINUTE", "60")),
+        "burst": 1,
+    },
+}
+
+# 공급처 원본 응답 디스크 캐시 (import --replay 용, gzip)
+# 저장은 기본 off ― 보존 기한/정리가 없으므로 replay 할 응답을 녹화할 때만 켬
+SUPPLIER_RESPONSE_CACHE_DIR = Path(
+    os.getenv("SUPPLIER_RESPONSE_CACHE_DIR", BASE_DIR / "var" / "supplier_responses")
+)
+SUPPLIER_RESPONSE_CACHE_RECORD = (
+    os.getenv("SUPPLIER_RESPONSE_CACHE_RECORD", "False") == "True"
+)
+
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
+# ========================
+# CATALOG
+# ========================
+
+CATALOG_PAGE_SIZE = 12
+
+# (created_at, id) 커서 페이지네이션 사용 여부 (기본 off)
+CATALOG_CURSOR_PAGINATION = os.getenv("CATALOG_CURSOR_PAGINATION", "False") == "True"
+
+# 커서 모드에서 ?page= 링크를 허용하는 최대 페이지 (그 이상은 404)
+CATALOG_MAX_OFFSET_PAGE = int(os.getenv("CATALOG_MAX_OFFSET_PAGE", "20"))
+
+# import 상품을 공급처 카테고리 경로 아래에 분류 (False 면 이전처럼 모두 미분류)
+CATALOG_IMPORT_CATEGORY_PATHS = (
+    os.getenv("CATALOG_IMPORT_CATEGORY_PATHS", "True") == "True"
+)
+
+# 비로그인 카탈로그 페이지 캐시 TTL (버전 무효화가 기본, TTL은 안전장치)
+CATALOG_PAGE_CACHE_TIMEOUT = int(os.getenv("CATALOG_PAGE_CACHE_TIMEOUT", "600"))
+
+# 가격비교 JSON Cache-Control max-age / s-maxage (ETag로 재검증)
+CATALOG_COMPARE_MAX_AGE = int(os.getenv("CATALOG_COMPARE_MAX_AGE", "60"))
+
+# 상품/오퍼 export API 토큰 (Authorization: Bearer ..., 비어 있으면 staff만)
+CATALOG_EXPORT_TOKEN = os.getenv("CATALOG_EXPORT_TOKEN", "")
+
+# 증분 export 워터마크를 앞당기는 시간(초) = 가장 긴 상품/오퍼 쓰기 트랜잭션 이상
+CATALOG_EXPORT_OVERLAP_SECONDS = int(os.getenv("CATALOG_EXPORT_OVERLAP_SECONDS", "900"))
+
 # ========================
 # PASSWORD VALIDATION
 # ========================
@@ -0,0 +1,61 @@
+document.addEventListener("DOMContentLoaded", function () {
+
+    const section = document.querySelector(".price-history");
+    if (!section) return;
+
+    const svg = section.querySelector(".price-history__chart");
+    const legend = section.querySelector(".price-history__legend");
+    const colors = ["#3e6f83", "#d9822b", "#5a9e4b", "#b0413e", "#7a5aa6"];
+
+    fetch(section.dataset.url)
+        .then(response => response.json())
+        .then(data => {
+            /* 일별 압축 기록 + 원본 기록을 [시각, 가격] 하나로 합침
+               가격은 모두 원화 환산가(data.currency) → 공급처 통화가 달라도 같은 축 */
+            const series = data.offers.map(offer => {
+                const daily = offer.daily.map(d => [Date.parse(d[0]), d[3]]);
+                const points = offer.points.map(p => [p[0], p[1]]);
+                return {
+                    supplier: offer.supplier,
+                    points: daily.concat(points).sort((a, b) => a[0] - b[0]),
+                };
+            }).filter(s => s.points.length);
+
+            if (!series.length) {
+                section.hidden = true;
+                return;
+            }
+
+            const all = series.flatMap(s => s.points);
+            const start = Date.parse(data.from);
+            const end = Math.max(Date.parse(data.to) + 86400000, ...all.map(p => p[0]));
+            const low = Math.min(...all.map(p => p[1]));
+            const high = Math.max(...all.map(p => p[1]));
+
+            const x = t => ((t - start) / (end - start || 1)) * 600;
+            const y = v => 190 - ((v - low) / (high - low || 1)) * 180;
+
+            series.forEach((s, i) => {
+                const color = colors[i % colors.length];
+
+                /* 계단형: 다음 변경 전까지 가격 유지, 마지막 값은 끝까지 */
+                let path = "";
+                s.points.forEach((p, j) => {
+                    path += (j ? " H" + x(p[0]) + " V" : "M" + x(p[0]) + " ") + y(p[1]);
+                });
+                path += " H600";
+
+                const line = document.createElementNS("http://www.w3.org/2000/svg", "path");
+                line.setAttribute("d", path);
+                line.setAttribute("fill", "none");
+                line.setAttribute("stroke", color);
+                line.setAttribute("stroke-width", "2");
+                svg.appendChild(line);
+
+                const item = document.createElement("li");
+                item.style.color = color;
+                item.textContent = s.supplier + " (" + data.currency + ")";
+                legend.appendChild(item);
+            });
+        });
+});